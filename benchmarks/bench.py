@@ -0,0 +1,279 @@
+"""
+Замеры скорости горячих участков симуляции и отрисовки.
+
+    python -m benchmarks.bench --output results.json
+    python -m benchmarks.bench --compare old.json new.json
+
+Результаты пишутся в JSON: для каждого замера имя, параметры
+(длина змейки, размер карты) и время одной операции в секундах.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from game.arena import Arena
+from game.direction import Direction
+from game.entities import Field, Food, Level, Snake, SnakePart
+from game.savegame import SaveGame
+from game.service_entities.vector import Vector
+
+SIZES = [(30, 30), (100, 100), (300, 300)]
+LENGTHS = [5, 500, 5000]
+QUICK_SIZES = [(30, 30), (100, 100)]
+QUICK_LENGTHS = [5, 500]
+VIEW_SIZE = (60, 40)
+ARENA_SNAKES = [10, 100, 1000]
+QUICK_ARENA_SNAKES = [10, 100]
+
+
+def serpentine_snake(length: int, width: int, height: int) -> Snake:
+    """
+    Змейка длины `length`, уложенная змейкой по строкам поля без стен по краям
+    (клетки 1..width-2, 1..height-2), голова - последняя уложенная клетка
+    """
+    inner_width = width - 2
+    if length > inner_width * (height - 2):
+        raise ValueError('Змейка не помещается на поле')
+    cells = []
+    for i in range(length):
+        row, column = divmod(i, inner_width)
+        if row % 2:
+            column = inner_width - 1 - column
+        cells.append(Vector(column + 1, row + 1))
+
+    parts = []
+    for i, location in enumerate(cells):
+        previous = cells[i - 1] if i else Vector(location.x - 1, location.y)
+        offset = (location.x - previous.x, location.y - previous.y)
+        direction = next(d for d, v in _offsets.items() if (v.x, v.y) == offset)
+        parts.append(SnakePart(location, direction))
+    return Snake(parts[::-1])
+
+
+_offsets = {
+    Direction.UP: Vector(0, -1),
+    Direction.DOWN: Vector(0, 1),
+    Direction.RIGHT: Vector(1, 0),
+    Direction.LEFT: Vector(-1, 0)
+}
+
+
+def border_walls(width: int, height: int) -> set:
+    walls = {Vector(x, y) for x in range(width) for y in (0, height - 1)}
+    walls |= {Vector(x, y) for x in (0, width - 1) for y in range(height)}
+    return walls
+
+
+def make_field(width: int, height: int, length: int) -> Field:
+    return Field(serpentine_snake(length, width, height), border_walls(width, height), (width, height))
+
+
+def write_map(path: str, width: int, height: int):
+    lines = ['#' * width]
+    lines += ['#' + ' ' * (width - 2) + '#' for _ in range(height - 2)]
+    lines += ['#' * width, 'right', '3 1', '2 1', '1 1', '10']
+    with open(path, 'w', encoding='utf-8') as mfd:
+        mfd.write('\n'.join(lines))
+
+
+def measure(function, repeat: int) -> dict:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'per_op_s': min(times), 'median_s': statistics.median(times), 'number': number}
+
+
+def fits(width, height, length):
+    return length <= (width - 2) * (height - 2) // 2
+
+
+def bench_snake(sizes, lengths, repeat):
+    for width, height in sizes:
+        for length in lengths:
+            if not fits(width, height, length):
+                continue
+            params = {'width': width, 'height': height, 'length': length}
+
+            snake = serpentine_snake(length, width, height)
+            yield 'Snake.step', params, measure(lambda: snake.step(None, (width, height)), repeat)
+
+            field = make_field(width, height, length)
+            yield 'Field.step_snake', params, measure(
+                lambda: (field.step_snake(), field.is_crash()), repeat)
+
+            snake = serpentine_snake(length, width, height)
+            walls = border_walls(width, height)
+            yield 'Snake.check_intersection', params, measure(
+                lambda: snake.check_intersection(walls), repeat)
+
+            field = make_field(width, height, length)
+            yield 'Field.generate_food', params, measure(
+                lambda: field.remove_food(field.generate_food(Food())), repeat)
+
+
+def bench_levels(sizes, lengths, repeat):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for width, height in sizes:
+            params = {'width': width, 'height': height}
+            map_path = os.path.join(temp_dir, f'map{width}x{height}.txt')
+            write_map(map_path, width, height)
+            Level.parse_map(map_path)
+            yield 'Level.parse_map', params, measure(lambda: Level.parse_map(map_path), repeat)
+
+        level = Level('free', 1)
+        for width, height in sizes:
+            for length in lengths:
+                if not fits(width, height, length):
+                    continue
+                level.field = make_field(width, height, length)
+                level.start_snake = level.field.snake.snapshot()
+                params = {'width': width, 'height': height, 'length': length}
+                yield 'Level.reset', params, measure(level.reset, repeat)
+
+                level.field.generate_food()
+                data = SaveGame.to_bytes(level)
+                yield 'SaveGame.to_bytes', params, measure(lambda: SaveGame.to_bytes(level), repeat)
+                yield 'SaveGame.from_bytes', params, measure(lambda: SaveGame.from_bytes(data, level), repeat)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def parallel_snakes(count: int, width: int, height: int, length: int = 5) -> list:
+    """`count` змеек, идущих вправо через строку; на поле без стен они не сталкиваются"""
+    rows = height // 2
+    spacing = width // (-(-count // rows))
+    if spacing <= length:
+        raise ValueError('Змейки не помещаются на поле')
+    return [Snake([SnakePart(Vector((i // rows * spacing - j) % width, i % rows * 2), Direction.RIGHT)
+                   for j in range(length)])
+            for i in range(count)]
+
+
+def bench_arena(counts, repeat):
+    width = height = 300
+    for count in counts:
+        snakes = parallel_snakes(count, width, height)
+        arena = Arena(Field(snakes[0], set(), (width, height)), snakes[1:], food_count=0)
+        yield 'Arena.step', {'width': width, 'height': height, 'snakes': count}, \
+            measure(arena.step, repeat)
+
+
+def bench_drawing(sizes, lengths, repeat):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    try:
+        import pygame
+    except ImportError:
+        print('pygame не установлен, замеры отрисовки пропущены', file=sys.stderr)
+        return
+    from game.drawing.game_drawing import FieldDrawing
+    from game.service_entities.viewport import Viewport
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    size_cell = FieldDrawing.size_cell
+    for width, height in sizes:
+        for length in lengths:
+            if not fits(width, height, length):
+                continue
+            for view_size in ((width, height), VIEW_SIZE):
+                if view_size == VIEW_SIZE and width <= view_size[0] and height <= view_size[1]:
+                    continue
+                for incremental in (False, True):
+                    field = make_field(width, height, length)
+                    field.generate_food()
+                    viewport = Viewport(view_size, (width, height))
+                    surface = pygame.Surface((viewport.width * size_cell, viewport.height * size_cell))
+                    drawing = FieldDrawing(field, '', surface, incremental, viewport)
+                    drawing.draw()
+
+                    def frame():
+                        field.step_snake()
+                        drawing.draw()
+
+                    params = {'width': width, 'height': height, 'length': length,
+                              'incremental': incremental, 'view': list(view_size)}
+                    yield 'FieldDrawing.draw', params, measure(frame, repeat)
+    pygame.display.quit()
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(quick=False, repeat=5, drawing=True) -> dict:
+    sizes = QUICK_SIZES if quick else SIZES
+    lengths = QUICK_LENGTHS if quick else LENGTHS
+    groups = [lambda: bench_snake(sizes, lengths, repeat),
+              lambda: bench_levels(sizes, lengths, repeat),
+              lambda: bench_arena(QUICK_ARENA_SNAKES if quick else ARENA_SNAKES, repeat)]
+    if drawing:
+        groups.append(lambda: bench_drawing(sizes, lengths, repeat))
+
+    results = []
+    for group in groups:
+        for name, params, result in group():
+            results.append({'name': name, 'params': params, **result})
+            print(f'{name:28} {json.dumps(params):70} {result["per_op_s"] * 1e6:12.2f} us',
+                  file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'revision': git_revision(),
+        },
+        'results': results,
+    }
+
+
+def _key(result):
+    return result['name'], json.dumps(result['params'], sort_keys=True)
+
+
+def compare(old: dict, new: dict):
+    """Печатает отношение new / old времени каждого замера"""
+    old_results = {_key(result): result for result in old['results']}
+    for result in new['results']:
+        key = _key(result)
+        if key not in old_results:
+            continue
+        ratio = result['per_op_s'] / old_results[key]['per_op_s']
+        print(f'{key[0]:28} {key[1]:70} {ratio:8.2f}x')
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Замеры скорости игры')
+    parser.add_argument('--output', help='файл для результатов в JSON (по умолчанию stdout)')
+    parser.add_argument('--quick', action='store_true', help='только маленькие размеры')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-drawing', action='store_true', help='без замеров отрисовки')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='сравнить два файла с результатами')
+    options = parser.parse_args(args)
+
+    if options.compare:
+        with open(options.compare[0]) as old, open(options.compare[1]) as new:
+            compare(json.load(old), json.load(new))
+        return
+
+    results = run(options.quick, options.repeat, not options.no_drawing)
+    if options.output:
+        with open(options.output, 'w') as fd:
+            json.dump(results, fd, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Арена: несколько змеек (игроки и боты) на одном поле с одновременными ходами"""
+import random
+
+from game.direction import Direction, TranslateDirection
+from game.entities import Field, Food, Level, Snake, SnakePart
+from game.service_entities.vector import Vector
+from game.settings import Settings
+
+__all__ = ['Arena']
+
+settings = Settings.get()
+
+_directions = tuple(Direction)
+
+
+class Arena:
+    """
+    Змейки ходят одновременно: сначала шагают все живые, потом
+    проверяются столкновения, потом съедается еда. Общим пространственным
+    индексом служит сетка занятости Field, где тела всех змеек учтены
+    счётчиком, поэтому столкновение головы с чужим телом или с чужой
+    головой стоит O(1) на змейку и не зависит от их числа.
+
+    Змейка может занять клетку, которую на этом же ходу покинул чей-то хвост.
+    Погибшая змейка убирается с поля, её результат остаётся в `scores`, пока её
+    номер не займёт новая змейка. Номер освобождается только после следующего
+    шага, чтобы гибель и появление змейки с одним номером не попали в один ход,
+    поэтому списки змеек не растут, сколько бы змеек ни погибало и ни появлялось.
+    """
+
+    # Сколько раз пробуем случайное место, чтобы поставить новую змейку
+    _spawn_attempts = 100
+
+    def __init__(self, field: Field, snakes=(), food_count: int = 1):
+        """
+        :param field: поле, основная змейка которого становится змейкой с номером 0
+        :param snakes: остальные змейки, ещё не отмеченные на поле
+        :param food_count: сколько обычной еды поддерживается на поле
+        """
+        self.field = field
+        # Голов несколько, и змейка 0 может погибнуть, поэтому еда - в любой свободной клетке
+        field.reachable_food = False
+        self.snakes = [field.snake]
+        self.scores = [0]
+        self.alive = [True]
+        self.food_count = food_count
+        self.steps = 0
+        # Номера погибших змеек: освобождённые до последнего шага и после него
+        self._free_numbers = []
+        self._removed = []
+        for snake in snakes:
+            self.add_snake(snake)
+        self._replenish_food()
+
+    @classmethod
+    def from_level(cls, level_name: str, bots: int, seed=None, food_count: int = None):
+        """Арена на карте уровня: змейка карты и `bots` змеек в случайных местах"""
+        field, _ = Level.parse_map(settings.map_file(level_name))
+        field.random = random.Random(seed)
+        arena = cls(field, food_count=bots + 1 if food_count is None else food_count)
+        for _ in range(bots):
+            arena.spawn_snake()
+        return arena
+
+    def add_snake(self, snake: Snake) -> int:
+        """
+        :return: номер змейки
+        """
+        self.field.place_snake(snake)
+        if self._free_numbers:
+            number = self._free_numbers.pop()
+            self.snakes[number] = snake
+            self.scores[number] = 0
+            self.alive[number] = True
+            return number
+        self.snakes.append(snake)
+        self.scores.append(0)
+        self.alive.append(True)
+        return len(self.snakes) - 1
+
+    def spawn_snake(self, length: int = 3) -> int:
+        """
+        Поставить прямую змейку длины `length` в случайное свободное место
+        :return: номер змейки
+        """
+        field = self.field
+        for _ in range(self._spawn_attempts):
+            head = field.random_free_cell()
+            direction = field.random.choice(_directions)
+            offset = TranslateDirection.dir_offset[TranslateDirection.opposite_dir[direction]]
+            body = [head]
+            for _ in range(length - 1):
+                location = Vector((body[-1].x + offset.x) % field.width,
+                                  (body[-1].y + offset.y) % field.height)
+                if field.cells[field.index(location)] != field.EMPTY or location in body:
+                    break
+                body.append(location)
+            else:
+                return self.add_snake(Snake([SnakePart(location, direction) for location in body]))
+        raise ValueError('Нет свободного места для змейки')
+
+    def remove_snake(self, number: int):
+        """Убрать змейку с поля, как если бы она погибла"""
+        if self.alive[number]:
+            self.alive[number] = False
+            self.field.lift_snake(self.snakes[number])
+            self._removed.append(number)
+
+    @property
+    def alive_count(self) -> int:
+        return sum(self.alive)
+
+    def _replenish_food(self):
+        basic = sum(1 for food in self.field.foods_location.values() if food == Food())
+        for _ in range(self.food_count - basic):
+            if not self.field.free_cells_count:
+                break
+            self.field.generate_food()
+
+    def step(self, directions=None) -> list:
+        """
+        Одновременный шаг всех живых змеек
+        :param directions: список поворотов по номерам змеек (None - не поворачивать)
+        :return: list[int], номера змеек, погибших на этом шаге
+        """
+        field = self.field
+        moved = [number for number, alive in enumerate(self.alive) if alive]
+        for number in moved:
+            field.step_snake(directions[number] if directions is not None else None,
+                             self.snakes[number])
+
+        # Сначала находим всех погибших, потом убираем их с поля,
+        # иначе при лобовом столкновении выжила бы вторая змейка
+        dead = [number for number in moved
+                if field.is_crash(self.snakes[number]) or len(self.snakes[number]) <= 1]
+        for number in dead:
+            self.remove_snake(number)
+
+        for number in moved:
+            if not self.alive[number]:
+                continue
+            head = self.snakes[number].head.location
+            if head in field.foods_location:
+                self.scores[number] += field.eat_food(head, self.snakes[number])
+
+        self._replenish_food()
+        self.steps += 1
+        self._free_numbers.extend(self._removed)
+        self._removed = []
+        return dead
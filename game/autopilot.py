@@ -0,0 +1,139 @@
+"""Автопилот: ведёт змейку к еде в обход стен и собственного тела"""
+from collections import deque
+
+from game.direction import Direction, TranslateDirection
+from game.entities import Field
+
+__all__ = ['Autopilot']
+
+
+class Autopilot:
+    """
+    Поиск в ширину по сетке занятости Field с переходом через края поля.
+    Клетка тела считается свободной, если к моменту прихода головы
+    соответствующая часть хвоста уже уйдёт. Найденный путь переиспользуется
+    на следующих шагах, пока он не устарел (еда съедена или пропала,
+    голова не там, где ожидалось).
+    """
+
+    def __init__(self):
+        self._size = None
+        self._neighbours = None
+        self._path = deque()
+        self._expected_head = None
+        self._target = None
+        self.searches = 0
+
+    def _prepare(self, field: Field):
+        if self._size == (field.width, field.height):
+            return
+        self._size = (field.width, field.height)
+        width, height = self._size
+        self._neighbours = []
+        for index in range(width * height):
+            x, y = index % width, index // width
+            cells = []
+            for direction, offset in TranslateDirection.dir_offset.items():
+                cells.append((((y + offset.y) % height) * width + (x + offset.x) % width, direction))
+            self._neighbours.append(cells)
+
+    @staticmethod
+    def _free_times(field: Field) -> dict:
+        """Через сколько шагов освободится каждая клетка тела"""
+        delay = max(field.snake.length_change, 0)
+        free_at = {}
+        for steps, part in enumerate(reversed(field.snake), start=1):
+            free_at[field.index(part.location)] = steps + delay
+        return free_at
+
+    def _search(self, field: Field, start: int, back: Direction,
+                free_at: dict, targets: set, steps: int = 0):
+        """
+        :param back: направление, запрещённое на первом ходе (разворот назад)
+        :param steps: сколько шагов уже сделано к моменту нахождения в `start`
+        :return: (путь до ближайшей цели или None, число достижимых клеток)
+        """
+        cells = field.cells
+        wall = field.WALL
+        came_from = {start: None}
+        queue = deque([(start, steps)])
+        while queue:
+            index, steps = queue.popleft()
+            if index in targets:
+                path = deque()
+                while came_from[index] is not None:
+                    index, direction = came_from[index]
+                    path.appendleft(direction)
+                return path, len(came_from)
+            for neighbour, direction in self._neighbours[index]:
+                if neighbour in came_from or cells[neighbour] & wall:
+                    continue
+                if index == start and direction == back:
+                    continue
+                if free_at.get(neighbour, 0) > steps + 1:
+                    continue
+                came_from[neighbour] = (index, direction)
+                queue.append((neighbour, steps + 1))
+        return None, len(came_from)
+
+    def _escape(self, field: Field, head: int, free_at: dict):
+        """Ход в сторону наибольшего достижимого пространства, когда к еде пути нет"""
+        best, best_area = None, 0
+        back = TranslateDirection.opposite_dir[field.snake.head.direction]
+        for neighbour, direction in self._neighbours[head]:
+            if direction == back or field.cells[neighbour] & field.WALL:
+                continue
+            if free_at.get(neighbour, 0) > 1:
+                continue
+            _, area = self._search(field, neighbour, TranslateDirection.opposite_dir[direction],
+                                   free_at, set(), steps=1)
+            if area > best_area:
+                best, best_area = direction, area
+        return best
+
+    def _is_blocked(self, field: Field, index: int) -> bool:
+        """Нельзя ли шагнуть в клетку `index` прямо сейчас"""
+        cell = field.cells[index]
+        if cell & field.WALL:
+            return True
+        if cell < field.BODY:
+            return False
+        tail = field.index(field.snake.tail.location)
+        return index != tail or field.snake.length_change > 0 or cell >= 2 * field.BODY
+
+    def direction(self, field: Field):
+        """Направление для следующего шага змейки (None - не поворачивать)"""
+        self._prepare(field)
+        head = field.index(field.snake.head.location)
+
+        if (not self._path
+                or head != self._expected_head
+                or self._target not in field.foods_location
+                or self._is_blocked(field, self._step(head, self._path[0]))):
+            self._path.clear()
+            self._target = None
+            self.searches += 1
+            free_at = self._free_times(field)
+            targets = {field.index(location)
+                       for location, food in field.foods_location.items()
+                       if food.score > 0}
+            back = TranslateDirection.opposite_dir[field.snake.head.direction]
+            path, _ = self._search(field, head, back, free_at, targets)
+            if not path:
+                self._expected_head = None
+                return self._escape(field, head, free_at)
+            self._path = path
+            end = head
+            for direction in path:
+                end = self._step(end, direction)
+            self._target = field.cell_location(end)
+
+        direction = self._path.popleft()
+        self._expected_head = self._step(head, direction)
+        return direction
+
+    def _step(self, index: int, direction: Direction) -> int:
+        for neighbour, neighbour_direction in self._neighbours[index]:
+            if neighbour_direction == direction:
+                return neighbour
+
@@ -0,0 +1,208 @@
+"""Пакетная симуляция: N независимых игр на одной карте в массивах NumPy"""
+import numpy as np
+
+from game.entities import Food, Level
+from game.settings import Settings
+
+__all__ = ['BatchLevel']
+
+settings = Settings.get()
+
+# Смещения (dx, dy) по значениям Direction
+_DX = np.array([0, 1, 0, -1], dtype=np.int64)
+_DY = np.array([-1, 0, 1, 0], dtype=np.int64)
+
+NO_DIRECTION = -1
+NO_FOOD = -1
+
+
+class BatchLevel:
+    """
+    `count` копий уровня `level_name`, которые шагают одним вызовом `step`
+    по тем же правилам, что Snake.step, Field.is_crash и Level.step_snake.
+
+    Клетки кодируются как в Field.index: y * width + x.
+    Состояние игр доступно в массивах длины `count`:
+    score, health, speed, length_change, length, win, game_over.
+    """
+
+    # Сколько раз пробуем случайную клетку, прежде чем искать свободную перебором
+    _sample_attempts = 8
+
+    def __init__(self, level_name: str, count: int, health: int = 1, seed=None):
+        field, self.max_score = Level.parse_map(settings.map_file(level_name))
+        self.name = level_name
+        self.count = count
+        self.width, self.height = field.width, field.height
+        size = self.width * self.height
+        self._rng = np.random.default_rng(seed)
+
+        self.walls = np.zeros(size, dtype=bool)
+        for location in field.walls:
+            self.walls[field.index(location)] = True
+
+        foods = [Food(*food) for food in settings.food]
+        if Food() not in foods:
+            foods.append(Food())
+        self.foods = foods
+        self.basic_food = foods.index(Food())
+        self._food_speed = np.array([f.speed_change for f in foods], dtype=np.float64)
+        self._food_length = np.array([f.length_change for f in foods], dtype=np.int64)
+        self._food_score = np.array([f.score for f in foods], dtype=np.int64)
+
+        # Начальная змейка от хвоста к голове, как она лежит в кольцевом буфере
+        start = [field.index(part.location) for part in reversed(field.snake)]
+        self._start_body = np.array(start, dtype=np.int64)
+        self._start_direction = field.snake.head.direction.value
+        self._start_speed = field.snake.speed
+        self._start_cells = np.zeros(size, dtype=np.int32)
+        np.add.at(self._start_cells, self._start_body, 1)
+
+        # Кольцевой буфер тела: body[g, head_pointer[g]] - голова игры g
+        self._capacity = size + 2
+        self.body = np.zeros((count, self._capacity), dtype=np.int64)
+        self.head_pointer = np.zeros(count, dtype=np.int64)
+        self.length = np.zeros(count, dtype=np.int64)
+        self.direction = np.zeros(count, dtype=np.int64)
+        self.length_change = np.zeros(count, dtype=np.int64)
+        self.speed = np.zeros(count, dtype=np.float64)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.health = np.full(count, health, dtype=np.int64)
+        self.win = np.zeros(count, dtype=bool)
+        self.game_over = np.zeros(count, dtype=bool)
+
+        # Счётчик частей тела и тип еды (индекс в self.foods) в каждой клетке
+        self.cells = np.zeros((count, size), dtype=np.int32)
+        self.food = np.full((count, size), NO_FOOD, dtype=np.int64)
+
+        self._games = np.arange(count)
+        self._reset(self._games)
+        self.spawn_food(self._games)
+
+    @property
+    def done(self) -> np.ndarray:
+        """Игры, которые больше не шагают (в свободной игре max_score не ограничивает)"""
+        if self.max_score > 0:
+            return self.game_over | self.win
+        return self.game_over.copy()
+
+    @property
+    def head(self) -> np.ndarray:
+        return self.body[self._games, self.head_pointer]
+
+    def _reset(self, games: np.ndarray):
+        length = len(self._start_body)
+        self.body[games, :length] = self._start_body
+        self.head_pointer[games] = length - 1
+        self.length[games] = length
+        self.direction[games] = self._start_direction
+        self.length_change[games] = 0
+        self.speed[games] = self._start_speed
+        self.score[games] = 0
+        self.cells[games] = self._start_cells
+
+    def _free_mask(self, games: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        return (~self.walls[cells]
+                & (self.cells[games, cells] == 0)
+                & (self.food[games, cells] == NO_FOOD))
+
+    def spawn_food(self, games: np.ndarray, food: int = None) -> np.ndarray:
+        """
+        Кладёт еду типа `food` (по умолчанию базовую) в случайную свободную клетку
+        каждой из игр `games`
+        :return: клетки с новой едой (-1, если свободных клеток не было)
+        """
+        if food is None:
+            food = self.basic_food
+        games = np.asarray(games, dtype=np.int64)
+        result = np.full(len(games), -1, dtype=np.int64)
+        pending = np.arange(len(games))
+        size = self.width * self.height
+
+        for _ in range(self._sample_attempts):
+            if not len(pending):
+                break
+            candidates = self._rng.integers(0, size, len(pending))
+            accepted = self._free_mask(games[pending], candidates)
+            result[pending[accepted]] = candidates[accepted]
+            pending = pending[~accepted]
+
+        everything = np.arange(size)
+        for i in pending:
+            free = np.flatnonzero(self._free_mask(np.full(size, games[i]), everything))
+            if len(free):
+                result[i] = self._rng.choice(free)
+
+        placed = result >= 0
+        self.food[games[placed], result[placed]] = food
+        return result
+
+    def _dequeue(self, games: np.ndarray):
+        if not len(games):
+            return
+        tail_pointer = (self.head_pointer[games] - self.length[games] + 1) % self._capacity
+        tail = self.body[games, tail_pointer]
+        self.cells[games, tail] -= 1
+        self.length[games] -= 1
+
+    def step(self, directions=None):
+        """
+        Один шаг всех незавершённых игр.
+        :param directions: направления (значения Direction или -1 - без поворота)
+        для каждой игры, либо None
+        """
+        games = stepped = self._games[~self.done]
+        if not len(games):
+            return
+
+        # Snake._get_direction_for_step
+        current = self.direction[games]
+        if directions is None:
+            proposed = current
+        else:
+            proposed = np.asarray(directions, dtype=np.int64)[games]
+            keep = (proposed == NO_DIRECTION) | (proposed == (current + 2) % 4)
+            proposed = np.where(keep, current, proposed)
+        self.direction[games] = proposed
+
+        # Snake.step: новая голова с переходом через край поля
+        head = self.body[games, self.head_pointer[games]]
+        x = (head % self.width + _DX[proposed]) % self.width
+        y = (head // self.width + _DY[proposed]) % self.height
+        new_head = y * self.width + x
+
+        self.head_pointer[games] = (self.head_pointer[games] + 1) % self._capacity
+        self.body[games, self.head_pointer[games]] = new_head
+        self.length[games] += 1
+        self.cells[games, new_head] += 1
+
+        length_change = self.length_change[games]
+        grow = length_change > 0
+        shrink = length_change < 0
+        self.length_change[games] = length_change - grow + shrink
+        self._dequeue(games[~grow & (self.length[games] > 0)])
+        self._dequeue(games[shrink & (self.length[games] > 0)])
+
+        # Field.is_crash и Level.lose
+        crash = (self.walls[new_head]
+                 | (self.cells[games, new_head] > 1)
+                 | (self.length[games] <= 1))
+        lost = games[crash]
+        self.health[lost] -= 1
+        self.game_over[lost[self.health[lost] <= 0]] = True
+        self._reset(lost[self.health[lost] > 0])
+
+        # Level.step_snake: поедание еды в клетке головы
+        games = games[~self.game_over[games]]
+        head = self.body[games, self.head_pointer[games]]
+        food = self.food[games, head]
+        eaten = food != NO_FOOD
+        games, head, food = games[eaten], head[eaten], food[eaten]
+
+        self.spawn_food(games[food == self.basic_food])
+        self.speed[games] *= self._food_speed[food]
+        self.length_change[games] += self._food_length[food]
+        self.score[games] += self._food_score[food]
+        self.food[games, head] = NO_FOOD
+
+        self.win[stepped] |= self.score[stepped] >= self.max_score
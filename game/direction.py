@@ -1,11 +1,10 @@
+from collections import deque
 from enum import Enum
 
-import pygame
-
 from game.service_entities.vector import Vector
 
 
-__all__ = ['Direction', 'TranslateDirection']
+__all__ = ['Direction', 'TranslateDirection', 'DirectionBuffer']
 
 
 class Direction(Enum):
@@ -37,9 +36,36 @@ class TranslateDirection:
         'down': Direction.DOWN
     }
 
-    direction = {
-        pygame.K_RIGHT: Direction.RIGHT,
-        pygame.K_LEFT: Direction.LEFT,
-        pygame.K_UP: Direction.UP,
-        pygame.K_DOWN: Direction.DOWN
-    }
+
+class DirectionBuffer:
+    """
+    Ограниченная очередь поворотов, накопленных между шагами змейки.
+    За шаг применяется один поворот, поэтому быстрые нажатия не теряются.
+    """
+
+    def __init__(self, max_size: int = 3):
+        self.max_size = max_size
+        self._buffer = deque()
+
+    def push(self, direction: Direction, current: Direction) -> bool:
+        """
+        :param current: текущее направление головы змейки
+        :return: принят ли поворот (повтор, разворот назад и переполнение отбрасываются)
+        """
+        last = self._buffer[-1] if self._buffer else current
+        if (len(self._buffer) >= self.max_size
+                or direction == last
+                or direction == TranslateDirection.opposite_dir[last]):
+            return False
+        self._buffer.append(direction)
+        return True
+
+    def pop(self):
+        """Следующий поворот или None"""
+        return self._buffer.popleft() if self._buffer else None
+
+    def clear(self):
+        self._buffer.clear()
+
+    def __len__(self):
+        return len(self._buffer)
@@ -1,5 +1,7 @@
 import pygame
 
+from game.drawing.text import text_cache
+
 __all__ = ['Button']
 
 
@@ -36,8 +38,7 @@ class Button:
 
     def _write_text(self):
         font_size = self._get_size_for_calibri()
-        font = pygame.font.SysFont("Calibri", font_size)
-        text = font.render(self.text, True, self.text_color)
+        text = text_cache.render(self.text, "Calibri", font_size, self.text_color)
         self.parent_surface.blit(text,
                                  (self.x + (self.width - text.get_width()) / 2,
                                   self.y + (self.height - text.get_height()) / 2))
@@ -6,43 +6,43 @@ from game.direction import Direction
 from game.entities import Food
 from game.entities import Level
 from game.settings import Settings
+from game.service_entities.viewport import Viewport
+from game.drawing.sprites import sprites
+from game.drawing.text import text_cache
 
-settings = Settings()
-
-__all__ = ['GameDrawing', 'FieldDrawing', 'FreeGameDrawing', 'LevelDrawing']
+settings = Settings.get()
 
+# Метка клетки, открывшейся при сдвиге видимой части: перерисовывается в любом случае
+_exposed = object()
 
-def _load_image(name):
-    return pygame.image.load(settings.picture(name))
+__all__ = ['GameDrawing', 'FieldDrawing', 'FreeGameDrawing', 'LevelDrawing']
 
 
-def _draw_image(play_surface, image, left, top, rotate_angle=0):
-    if rotate_angle:
-        image = pygame.transform.rotate(image, rotate_angle)
+def _draw_image(play_surface, name, left, top, rotate_angle=0):
+    image = sprites.get(name, rotate_angle)
     rect_image = image.get_rect(topleft=(top, left))
     play_surface.blit(image, rect_image)
 
 
 class FieldDrawing:
-    size_cell = settings.picture_size
+    # size_cell и _food_image заполняются из настроек в _apply_settings
+    size_cell = 0
 
-    # region load_image
+    # region sprite names
 
-    _wall = _load_image('wall')
-    _basic_food = _load_image('basic_apple')
-    _gold_apple = _load_image('gold_apple')
-    _wormy_apple = _load_image('wormy_apple')
-    _high_speed_apple = _load_image('high_speed_apple')
-    _snake_body = _load_image('snake_body')
-    _snake_head = _load_image('snake_head')
-    _snake_tail = _load_image('snake_tail')
-    _snake_turn = _load_image('snake_turn')
+    _wall = 'wall'
+    _basic_food = 'basic_apple'
+    _gold_apple = 'gold_apple'
+    _wormy_apple = 'wormy_apple'
+    _high_speed_apple = 'high_speed_apple'
+    _snake_body = 'snake_body'
+    _snake_head = 'snake_head'
+    _snake_tail = 'snake_tail'
+    _snake_turn = 'snake_turn'
 
     # endregion
 
-    _food_image = {Food(*food): _load_image(name)
-                   for food, name
-                   in settings.food_name_picture.items()}
+    _food_image = {}
 
     # Угол поворота [head, body, tail] змейки согласно его направлению
     _dir_turn_angle_SBI = {
@@ -64,113 +64,354 @@ class FieldDrawing:
         (Direction.DOWN, Direction.RIGHT): 90
     }
 
-    def __init__(self, field, path_to_bg, surface):
+    def __init__(self, field, path_to_bg, surface, incremental=False, viewport=None):
+        """
+        :param incremental: перерисовывать только изменившиеся с прошлого кадра клетки;
+        какие клетки могли измениться, берётся из Field.track_changes и концов змейки
+        :param viewport: видимая часть поля (Viewport), по умолчанию - поле целиком
+        """
         self.field = field
-        if (field.height * self.size_cell != surface.get_height()
-                or field.width * self.size_cell != surface.get_width()):
-            raise ValueError('Размеры surface не соответствуют размерам поля')
+        if viewport is None:
+            viewport = Viewport((field.width, field.height), (field.width, field.height))
+        self.viewport = viewport
+        if (viewport.height * self.size_cell != surface.get_height()
+                or viewport.width * self.size_cell != surface.get_width()):
+            raise ValueError('Размеры surface не соответствуют размерам видимой части поля')
+        self.viewport.center(field.snake.head.location)
 
         self.surface = surface
         self.bg = (pygame.image.load(path_to_bg)
                    if os.path.exists(path_to_bg)
                    else None)
-
-    def _draw_snake(self):
-        pointer = 0
+        if self.bg is not None and pygame.display.get_surface() is not None:
+            self.bg = self.bg.convert()
+
+        sprites.prepare([self._snake_head, self._snake_body,
+                         self._snake_tail, self._snake_turn],
+                        sprites.angles)
+        sprites.prepare([self._wall, *self._food_image.values()])
+
+        self.incremental = incremental
+        self._changes = field.track_changes() if incremental else None
+        self._static = None
+        self._last_frame = None
+        self._exposed_cells = []
+        # Спрайты змейки по клеткам всего поля: index -> [(image, rotate_angle)];
+        # змейка и клетка головы, для которых он построен
+        self._snake_map = {}
+        self._drawn_snake = None
+        self._drawn_head = None
+
+    def _part_sprite(self, part, prev_part, last: bool) -> tuple:
+        """
+        Спрайт части змейки: (image, rotate_angle)
+        :param prev_part: соседняя часть ближе к голове, None у головы
+        :param last: часть - хвост
+        """
+        if prev_part is None:
+            return self._snake_head, self._dir_turn_angle_SBI[part.direction]
+        if last:
+            return self._snake_tail, self._dir_turn_angle_SBI[prev_part.direction]
+        if prev_part.direction == part.direction:
+            return self._snake_body, self._dir_turn_angle_SBI[part.direction]
+        return self._snake_turn, self._dir_turn_angle_STI[part.direction, prev_part.direction]
+
+    def _snake_sprites(self):
+        """Спрайты змейки: (location, image, rotate_angle) от головы к хвосту"""
+        last = len(self.field.snake) - 1
         prev_sp = None
-        for sp in self.field.snake:
-            location = (sp.location.y * self.size_cell,
-                        sp.location.x * self.size_cell)
-            if pointer == 0:
-                _draw_image(self.surface,
-                            self._snake_head,
-                            *location,
-                            rotate_angle=self._dir_turn_angle_SBI[sp.direction])
-
-            elif pointer == len(self.field.snake) - 1:
-                _draw_image(self.surface,
-                            self._snake_tail,
-                            *location,
-                            rotate_angle=self._dir_turn_angle_SBI[prev_sp.direction])
+        for pointer, sp in enumerate(self.field.snake):
+            yield (sp.location, *self._part_sprite(sp, prev_sp, pointer == last))
+            prev_sp = sp
 
-            else:
-                if prev_sp.direction == sp.direction:
-                    _draw_image(self.surface,
-                                self._snake_body,
-                                *location,
-                                rotate_angle=self._dir_turn_angle_SBI[sp.direction])
-                else:
-                    _draw_image(self.surface,
-                                self._snake_turn,
-                                *location,
-                                rotate_angle=self._dir_turn_angle_STI[sp.direction, prev_sp.direction])
+    def _visible_snake_sprites(self):
+        viewport = self.viewport
+        for location, image, angle in self._snake_sprites():
+            if location in viewport:
+                yield self.field.index(location), image, angle
 
-            prev_sp = sp
-            pointer += 1
+    def _visible_cells(self, mask: int):
+        """
+        Индексы видимых клеток, в коде которых есть биты `mask`.
+        Сетка занятости поля служит пространственным индексом:
+        просматриваются только видимые строки, а не все стены и еда
+        """
+        cells = self.field.cells
+        for start, stop in self.viewport.index_ranges():
+            for index, cell in enumerate(cells[start:stop], start):
+                if cell & mask:
+                    yield index
+
+    def _visible_food(self):
+        for index in self._visible_cells(self.field.FOOD):
+            yield index, self.field.foods_location[self.field.cell_location(index)]
+
+    def _draw_snake(self):
+        for index, image, angle in self._visible_snake_sprites():
+            rect = self._cell_rect(index)
+            _draw_image(self.surface, image, rect.top, rect.left, rotate_angle=angle)
 
     def _draw_food(self):
-        for location, food in self.field.foods_location.items():
-            _draw_image(
-                self.surface,
-                self._food_image[food],
-                location.y * self.size_cell,
-                location.x * self.size_cell)
+        for index, food in self._visible_food():
+            rect = self._cell_rect(index)
+            _draw_image(self.surface, self._food_image[food], rect.top, rect.left)
 
     def _draw_walls(self):
-        for location in self.field.walls:
-            _draw_image(
-                self.surface,
-                self._wall,
-                location.y * self.size_cell,
-                location.x * self.size_cell)
-
-    def _draw_bg(self):
+        for index in self._visible_cells(self.field.WALL):
+            rect = self._cell_rect(index)
+            _draw_image(self.surface, self._wall, rect.top, rect.left)
+
+    def _draw_bg(self, rect: pygame.Rect = None):
+        """Фон видимой части поля или её области `rect` (в координатах surface)"""
+        if rect is None:
+            rect = self.surface.get_rect()
+        area = rect.move(self.viewport.x * self.size_cell, self.viewport.y * self.size_cell)
+        if self.bg is None or not self.bg.get_rect().contains(area):
+            self.surface.fill(pygame.Color('white'), rect)
         if self.bg is not None:
-            self.surface.blit(self.bg, (0, 0))
+            self.surface.blit(self.bg, rect, area)
+
+    def _cell_sprites(self, index: int) -> list:
+        """Спрайты клетки поверх статического слоя в порядке рисования (змейка, стена, еда)"""
+        sprites = list(self._snake_map.get(index, ()))
+        cell = self.field.cells[index]
+        if sprites and cell & self.field.WALL:
+            sprites.append((self._wall, 0))
+        if cell & self.field.FOOD:
+            sprites.append((self._food_image[self.field.foods_location[self.field.cell_location(index)]], 0))
+        return sprites
+
+    def _frame(self) -> dict:
+        """
+        Видимые спрайты поверх статического слоя: index клетки -> [(image, rotate_angle)].
+        Строится целиком: проход по всей змейке и видимым клеткам
+        """
+        field = self.field
+        self._snake_map = {}
+        for location, image, angle in self._snake_sprites():
+            self._snake_map.setdefault(field.index(location), []).append((image, angle))
+        self._drawn_snake = field.snake
+        self._drawn_head = field.index(field.snake.head.location)
+
+        viewport = self.viewport
+        frame = {index: self._cell_sprites(index) for index in self._snake_map
+                 if field.cell_location(index) in viewport}
+        for index in self._visible_cells(field.FOOD):
+            frame[index] = self._cell_sprites(index)
+        return frame
+
+    def _update_snake_map(self, changes) -> list:
+        """
+        Обновить спрайты змейки после её шагов: меняются только клетки от головы
+        до прежней головы, хвост и освобождённые клетки (они есть в `changes`)
+        :return: клетки, спрайты змейки в которых пересчитаны, или None,
+        если нужен полный кадр (змейку заменили или её части наложились)
+        """
+        field = self.field
+        snake = field.snake
+        if snake is not self._drawn_snake:
+            return None
+        cells = field.cells
+        snake_map = self._snake_map
+        for index in changes:
+            if cells[index] < field.BODY:
+                snake_map.pop(index, None)
+
+        touched = []
+        last = len(snake) - 1
+        prev_part = None
+        for number, part in enumerate(snake):
+            if number == last:
+                break
+            index = field.index(part.location)
+            snake_map[index] = [self._part_sprite(part, prev_part, False)]
+            touched.append(index)
+            if index == self._drawn_head:
+                break
+            prev_part = part
+        parts = reversed(snake)
+        tail = next(parts)
+        index = field.index(tail.location)
+        snake_map[index] = [self._part_sprite(tail, next(parts, None), True)]
+        touched.append(index)
+
+        if any(cells[index] >= 2 * field.BODY for index in touched):
+            return None
+        self._drawn_head = field.index(snake.head.location)
+        return touched
+
+    def _cell_rect(self, index: int) -> pygame.Rect:
+        """Клетка поля с индексом `index` в координатах surface"""
+        return pygame.Rect((index % self.field.width - self.viewport.x) * self.size_cell,
+                           (index // self.field.width - self.viewport.y) * self.size_cell,
+                           self.size_cell, self.size_cell)
+
+    def invalidate(self):
+        """Сбросить статический слой (фон и стены) и перерисовать поле целиком"""
+        self._static = None
+        self._last_frame = None
+
+    def _scroll(self, dx: int, dy: int):
+        """
+        Сдвинуть уже нарисованное вслед за видимой частью поля.
+        Открывшиеся клетки дорисовываются в статическом слое здесь,
+        а спрайты на них - в _draw_changes
+        """
+        viewport = self.viewport
+        if (self._static is None or self._last_frame is None
+                or abs(dx) >= viewport.width or abs(dy) >= viewport.height):
+            self.invalidate()
+            return
+        self.surface.scroll(-dx * self.size_cell, -dy * self.size_cell)
+        self._static.scroll(-dx * self.size_cell, -dy * self.size_cell)
+
+        columns = range(viewport.width - dx, viewport.width) if dx > 0 else range(-dx)
+        rows = range(viewport.height - dy, viewport.height) if dy > 0 else range(-dy)
+        exposed = []
+        for row, (start, stop) in enumerate(viewport.index_ranges()):
+            if row in rows:
+                exposed.extend(range(start, stop))
+            else:
+                exposed.extend(start + column for column in columns)
+
+        surface, self.surface = self.surface, self._static
+        for index in exposed:
+            rect = self._cell_rect(index)
+            self._draw_bg(rect)
+            if self.field.cells[index] & self.field.WALL:
+                _draw_image(self.surface, self._wall, rect.top, rect.left)
+        self.surface = surface
+
+        self._last_frame = {index: sprites for index, sprites in self._last_frame.items()
+                            if self.field.cell_location(index) in viewport}
+        for index in exposed:
+            self._last_frame[index] = _exposed
+        self._exposed_cells = exposed
+
+    def _draw_changes(self) -> list:
+        if self._static is None:
+            self._static = pygame.Surface(self.surface.get_size())
+            surface, self.surface = self.surface, self._static
+            self._draw_bg()
+            self._draw_walls()
+            self.surface = surface
+
+        changes = self._changes
+        touched = None
+        if self._last_frame is not None:
+            touched = self._update_snake_map(changes)
+            if touched is None:
+                self._last_frame = None
+
+        if self._last_frame is None:
+            frame = self._last_frame = self._frame()
+            self.surface.blit(self._static, (0, 0))
+            changed = list(frame)
         else:
-            self.surface.fill(pygame.Color('white'))
+            frame = self._last_frame
+            viewport = self.viewport
+            changed = []
+            for index in {*changes, *touched, *self._exposed_cells}:
+                if self.field.cell_location(index) not in viewport:
+                    continue
+                sprites = self._cell_sprites(index)
+                if sprites != frame.get(index, []):
+                    changed.append(index)
+                    if sprites:
+                        frame[index] = sprites
+                    else:
+                        frame.pop(index, None)
+        changes.clear()
+        self._exposed_cells = []
+
+        dirty = []
+        for index in changed:
+            rect = self._cell_rect(index)
+            self.surface.blit(self._static, rect, rect)
+            for image, angle in frame.get(index, ()):
+                _draw_image(self.surface, image, rect.top, rect.left, rotate_angle=angle)
+            dirty.append(rect)
+
+        if touched is None:
+            dirty = [self.surface.get_rect()]
+        return dirty
+
+    def draw(self) -> list:
+        """
+        :return: list[pygame.Rect], изменённые области surface
+        """
+        dx, dy = self.viewport.follow(self.field.snake.head.location)
+        if self.incremental:
+            if not dx and not dy:
+                return self._draw_changes()
+            self._scroll(dx, dy)
+            self._draw_changes()
+            return [self.surface.get_rect()]
 
-    def draw(self):
         self._draw_bg()
         self._draw_snake()
         self._draw_walls()
         self._draw_food()
+        return [self.surface.get_rect()]
 
 
 class GameDrawing:
-    size_cell = settings.picture_size
+    size_cell = 0
 
-    _heart = _load_image('heart')
-    _toolbar = _load_image('toolbar')
+    _heart = 'heart'
+    _toolbar = 'toolbar'
 
-    def __init__(self, level, delta_x=0, delta_y=0):
+    def __init__(self, level, delta_x=0, delta_y=0, incremental=True):
         """
         :param delta_x: смещение рисования поля по Ox относительно левого верхнего угла
         :param delta_y: смещение рисования поля по Oy относительно левого верхнего угла
+        :param incremental: перерисовывать только изменившиеся клетки поля
         """
 
         self.level = level
         self.delta_x = delta_x
         self.delta_y = delta_y
 
-        width_field = self.size_cell * level.field.width
-        height_field = self.size_cell * level.field.height
+        viewport = Viewport(settings.view_size, (level.field.width, level.field.height))
+        width_field = self.size_cell * viewport.width
+        height_field = self.size_cell * viewport.height
         self.surface = pygame.display.set_mode((width_field + self.delta_x,
                                                 height_field + self.delta_y))
 
+        sprites.prepare([self._heart, self._toolbar])
+
         field_surface = self.surface.subsurface(
             pygame.Rect(self.delta_x, self.delta_y, width_field, height_field))
 
         self.field_drawer = FieldDrawing(level.field,
                                          settings.background_image(level.name),
-                                         field_surface)
+                                         field_surface,
+                                         incremental,
+                                         viewport)
+        self._last_toolbar_state = None
+
+    def _toolbar_state(self):
+        """Всё, от чего зависит вид панели; панель перерисовывается при его изменении"""
+        return None
 
     def _draw_toolbar(self):
         pass
 
-    def draw(self):
-        self.field_drawer.draw()
-        self._draw_toolbar()
+    def draw(self) -> list:
+        """
+        :return: list[pygame.Rect], изменённые области окна для pygame.display.update
+        """
+        dirty = [rect.move(self.delta_x, self.delta_y)
+                 for rect in self.field_drawer.draw()]
+
+        toolbar_state = self._toolbar_state()
+        if (not self.field_drawer.incremental
+                or self._last_toolbar_state is None
+                or toolbar_state != self._last_toolbar_state):
+            self._draw_toolbar()
+            self._last_toolbar_state = toolbar_state
+            dirty.append(pygame.Rect(0, 0, self.surface.get_width(), self.delta_y))
+        return dirty
 
 
 class LevelDrawing(GameDrawing):
@@ -180,8 +421,11 @@ class LevelDrawing(GameDrawing):
         self.level_number = level_number
         self.count_levels = count_levels
 
+    def _toolbar_state(self):
+        return self.level.score, self.level.health
+
     def _draw_toolbar(self):
-        for i in range(self.level.field.width):
+        for i in range(self.field_drawer.viewport.width):
             _draw_image(self.surface, self._toolbar, 0, i * self.size_cell)
             _draw_image(self.surface, self._toolbar, self.size_cell, i * self.size_cell)
 
@@ -190,16 +434,16 @@ class LevelDrawing(GameDrawing):
                         self.delta_y / 2 - 8, self.size_cell + 24 * i)
 
         # пишет счёт у данного уровня
-        s_font = pygame.font.SysFont('monaco', 24)
-        s_surf = s_font.render(f'Score: {self.level.score}/{self.level.max_score}', True, pygame.Color('white'))
+        s_surf = text_cache.render(f'Score: {self.level.score}/{self.level.max_score}',
+                                   'monaco', 24, pygame.Color('white'))
         s_rect = s_surf.get_rect()
         s_rect.topleft = ((self.surface.get_width() - s_rect.width) / 2,
                           (self.delta_y - s_rect.height) / 2)
         self.surface.blit(s_surf, s_rect)
 
         # пишет какой уровень сейчас и сколько в общем
-        lvl_font = pygame.font.SysFont('monaco', 24)
-        lvl_surf = lvl_font.render(f'Level: {self.level_number}/{self.count_levels}', True, pygame.Color('white'))
+        lvl_surf = text_cache.render(f'Level: {self.level_number}/{self.count_levels}',
+                                     'monaco', 24, pygame.Color('white'))
         lvl_rect = lvl_surf.get_rect()
         lvl_rect.topleft = (self.surface.get_width() - 20 - lvl_rect.width,
                             (self.delta_y - s_rect.height) / 2)
@@ -210,14 +454,26 @@ class FreeGameDrawing(GameDrawing):
     def __init__(self, level: Level):
         super().__init__(level, delta_y=self.size_cell * 2)
 
+    def _toolbar_state(self):
+        return self.level.score
+
     def _draw_toolbar(self):
-        for i in range(self.level.field.width):
+        for i in range(self.field_drawer.viewport.width):
             _draw_image(self.surface, self._toolbar, 0, i * self.size_cell)
             _draw_image(self.surface, self._toolbar, self.size_cell, i * self.size_cell)
 
-        s_font = pygame.font.SysFont('monaco', 24)
-        s_surf = s_font.render(f'Score: {self.level.score}', True, pygame.Color('white'))
+        s_surf = text_cache.render(f'Score: {self.level.score}', 'monaco', 24, pygame.Color('white'))
         s_rect = s_surf.get_rect()
         s_rect.topleft = ((self.surface.get_width() - s_rect.width) / 2,
                           (self.delta_y - s_rect.height) / 2)
         self.surface.blit(s_surf, s_rect)
+
+
+@Settings.on_reload
+def _apply_settings(settings: Settings):
+    """Размер клетки и спрайты еды из настроек"""
+    FieldDrawing.size_cell = GameDrawing.size_cell = settings.picture_size
+    FieldDrawing._food_image = {Food(*food): name for food, name in settings.food_name_picture.items()}
+
+
+_apply_settings(settings)
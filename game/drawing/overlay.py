@@ -0,0 +1,46 @@
+import pygame
+
+from game.drawing.text import text_cache
+
+__all__ = ['ProfilerOverlay']
+
+
+class ProfilerOverlay:
+    """
+    Перцентили фаз профайлера в левом верхнем углу окна.
+    Перед рисованием сохраняет то, что под ним, и возвращает это
+    в следующем кадре, чтобы не мешать перерисовке изменившихся клеток.
+    """
+
+    font = 'monaco'
+    font_size = 14
+    line_height = 14
+    width = 260
+
+    def __init__(self, surface, profiler, phases=('events', 'step', 'draw', 'display', 'frame')):
+        self.surface = surface
+        self.profiler = profiler
+        self.phases = phases
+        self.rect = pygame.Rect(0, 0,
+                                min(self.width, surface.get_width()),
+                                min(self.line_height * len(phases), surface.get_height()))
+        self._under = None
+
+    def restore(self) -> pygame.Rect:
+        """Вернуть то, что было под оверлеем; вызывается до отрисовки кадра"""
+        if self._under is not None:
+            self.surface.blit(self._under, self.rect)
+        return self.rect
+
+    def draw(self) -> pygame.Rect:
+        self._under = self.surface.subsurface(self.rect).copy()
+        self.surface.fill(pygame.Color('black'), self.rect)
+        for i, name in enumerate(self.phases):
+            percentiles = self.profiler.percentiles(name)
+            if not percentiles:
+                continue
+            text = f'{name:8} ' + ' '.join(f'p{p} {value * 1e3:.2f}'
+                                           for p, value in percentiles.items())
+            self.surface.blit(text_cache.render(text, self.font, self.font_size, pygame.Color('white')),
+                              (self.rect.x + 2, self.rect.y + i * self.line_height))
+        return self.rect
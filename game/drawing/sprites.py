@@ -0,0 +1,60 @@
+import pygame
+
+from game.settings import Settings
+
+settings = Settings.get()
+
+__all__ = ['SpriteCache', 'sprites']
+
+
+class SpriteCache:
+    """
+    Спрайты из секции [PICTURES], загруженные один раз.
+    Каждый поворот хранится готовым и в формате экрана,
+    поэтому при рисовании нужен только blit.
+    """
+
+    # Все углы, на которые поворачиваются спрайты змейки
+    angles = (0, 90, 180, -90)
+
+    def __init__(self):
+        self._images = {}
+        self._sprites = {}
+
+    def clear(self):
+        """Забыть загруженные спрайты (например, после смены файлов в настройках)"""
+        self._images.clear()
+        self._sprites.clear()
+
+    def _image(self, name: str) -> pygame.Surface:
+        image = self._images.get(name)
+        if image is None:
+            image = self._images[name] = pygame.image.load(settings.picture(name))
+        return image
+
+    def get(self, name: str, angle: int = 0) -> pygame.Surface:
+        """Спрайт `name`, повёрнутый на `angle` градусов"""
+        sprite = self._sprites.get((name, angle))
+        if sprite is None:
+            sprite = self._image(name)
+            if angle:
+                sprite = pygame.transform.rotate(sprite, angle)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self._sprites[name, angle] = sprite
+        return sprite
+
+    def prepare(self, names, angles=(0,)):
+        """
+        Заранее построить повороты `angles` спрайтов `names`.
+        Вызывается после pygame.display.set_mode, чтобы спрайты
+        были приведены к формату нового экрана.
+        """
+        for name in names:
+            for angle in angles:
+                self._sprites.pop((name, angle), None)
+                self.get(name, angle)
+
+
+sprites = SpriteCache()
+Settings.on_reload(lambda _: sprites.clear())
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+import pygame
+
+__all__ = ['TextCache', 'text_cache']
+
+
+class TextCache:
+    """
+    Кэш шрифтов по (name, size) и отрисованных надписей по (text, font, color)
+    с вытеснением давно не используемых (LRU)
+    """
+
+    def __init__(self, max_fonts=32, max_surfaces=256):
+        self.max_fonts = max_fonts
+        self.max_surfaces = max_surfaces
+        self._fonts = OrderedDict()
+        self._surfaces = OrderedDict()
+
+    @staticmethod
+    def _get(cache: OrderedDict, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _put(cache: OrderedDict, key, value, max_size):
+        cache[key] = value
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+    def font(self, name: str, size: int) -> pygame.font.Font:
+        font = self._get(self._fonts, (name, size))
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self._put(self._fonts, (name, size), font, self.max_fonts)
+        return font
+
+    def render(self, text: str, name: str, size: int, color) -> pygame.Surface:
+        """Сглаженная надпись `text` шрифтом `name` размера `size`"""
+        key = (text, name, size, tuple(pygame.Color(color)))
+        surface = self._get(self._surfaces, key)
+        if surface is None:
+            surface = self.font(name, size).render(text, True, color)
+            self._put(self._surfaces, key, surface, self.max_surfaces)
+        return surface
+
+    def clear(self):
+        self._fonts.clear()
+        self._surfaces.clear()
+
+
+text_cache = TextCache()
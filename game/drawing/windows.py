@@ -1,5 +1,6 @@
 import pygame
 from game.drawing.components import *
+from game.drawing.text import text_cache
 
 __all__ = ['Menu', 'WinWindow', 'GameOverWindow', 'EndFreeGameWindow']
 
@@ -24,8 +25,7 @@ class WinWindow:
 
     def draw(self):
         self.surface.fill(pygame.Color('white'))
-        font_win = pygame.font.SysFont("Calibri", 40)
-        text_win = font_win.render('You WIN!', True, pygame.Color('black'))
+        text_win = text_cache.render('You WIN!', "Calibri", 40, pygame.Color('black'))
         self.surface.blit(text_win, ((self.surface.get_width() - text_win.get_width()) / 2, 30))
         for button in self.buttons:
             button.draw()
@@ -38,8 +38,7 @@ class GameOverWindow:
 
     def draw(self):
         self.surface.fill(pygame.Color('white'))
-        font_lose = pygame.font.SysFont("Calibri", 30)
-        text_lose = font_lose.render('Game Over :(', True, pygame.Color('black'))
+        text_lose = text_cache.render('Game Over :(', "Calibri", 30, pygame.Color('black'))
         self.surface.blit(text_lose, ((self.surface.get_width() - text_lose.get_width()) / 2, 30))
         for button in self.buttons:
             button.draw()
@@ -53,12 +52,10 @@ class EndFreeGameWindow:
 
     def draw(self):
         self.surface.fill(pygame.Color('white'))
-        font_win = pygame.font.SysFont("Calibri", 25)
-        text_win = font_win.render('End of the Game', True, pygame.Color('black'))
+        text_win = text_cache.render('End of the Game', "Calibri", 25, pygame.Color('black'))
         self.surface.blit(text_win, ((self.surface.get_width() - text_win.get_width()) / 2, 20))
 
-        font_score = pygame.font.SysFont("Calibri", 20)
-        text_score = font_score.render(f'Score: {self.score}', True, pygame.Color('black'))
+        text_score = text_cache.render(f'Score: {self.score}', "Calibri", 20, pygame.Color('black'))
         self.surface.blit(text_score, ((self.surface.get_width() - text_score.get_width()) / 2, 50))
         for button in self.buttons:
             button.draw()
@@ -1,14 +1,20 @@
 import random
-from copy import deepcopy, copy
+from copy import copy
+from typing import NamedTuple
 
 from game.direction import *
+from game.food_spawner import FoodSpawner
+from game.level_format import CompiledMap, flood_fill, label_regions
 from game.service_entities.queue import Queue
 from game.service_entities.vector import Vector
 from game.settings import Settings
 
-__all__ = ['Food', 'SnakePart', 'Snake', 'Field', 'Level']
+__all__ = ['Food', 'SnakePart', 'Snake', 'Field', 'Level',
+           'SnakeSnapshot', 'FieldSnapshot', 'LevelSnapshot']
 
-settings = Settings()
+settings = Settings.get()
+
+_directions = tuple(Direction)
 
 
 class Food:
@@ -28,7 +34,33 @@ class Food:
                 and self.length_change == other.length_change)
 
 
+class SnakeSnapshot(NamedTuple):
+    """Неизменяемый снимок змейки"""
+    locations: tuple  # tuple[(x, y)], от головы к хвосту
+    directions: bytes  # Direction.value каждой части, от головы к хвосту
+    length_change: int
+    speed: float
+
+
+class FieldSnapshot(NamedTuple):
+    snake: SnakeSnapshot
+    foods: tuple  # tuple[(x, y, Food)]
+
+
+class LevelSnapshot(NamedTuple):
+    field: FieldSnapshot
+    score: int
+    health: int
+    win_flag: bool
+    game_over_flag: bool
+    steps: int = 0
+    bonus_food_location: Vector = None
+    food_spawner: tuple = None  # FoodSpawner.state(), None - сроки бонусной еды с начала
+
+
 class SnakePart:
+    __slots__ = ('direction', 'location')
+
     def __init__(self, location: Vector, direction: Direction):
         self.direction = direction
         self.location = location
@@ -54,20 +86,28 @@ class Snake:
             return self.head.direction
         return proposed_direction
 
-    def step(self, direction: Direction = None, size_field: tuple = None):
+    def step(self, direction: Direction = None, size_field: tuple = None) -> list:
+        """
+        :return: list[SnakePart], части тела, покинувшие змейку на этом шаге
+        """
         direction = self._get_direction_for_step(direction)
-        new_head_location = self.head.location + TranslateDirection.dir_offset[direction]
+        location = self.head.location
+        offset = TranslateDirection.dir_offset[direction]
+        x = location.x + offset.x
+        y = location.y + offset.y
         if size_field is not None:
-            new_head_location.x %= size_field[0]
-            new_head_location.y %= size_field[1]
-        self.body.enqueue(SnakePart(new_head_location, direction))
+            x %= size_field[0]
+            y %= size_field[1]
+        self.body.enqueue(SnakePart(Vector(x, y), direction))
+        removed = []
         if self.length_change > 0:
             self.length_change -= 1
-            return
+            return removed
         if self.length_change < 0:
             self.length_change += 1
-            self.body.dequeue()
-        self.body.dequeue()
+            removed.append(self.body.dequeue())
+        removed.append(self.body.dequeue())
+        return removed
 
     def check_intersection(self, points: set = None) -> bool:
         if points is None:
@@ -80,6 +120,20 @@ class Snake:
 
         return count != len(_points)
 
+    def snapshot(self) -> SnakeSnapshot:
+        return SnakeSnapshot(tuple((part.location.x, part.location.y) for part in self),
+                             bytes(part.direction.value for part in self),
+                             self.length_change,
+                             self.speed)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: SnakeSnapshot):
+        snake = cls([SnakePart(Vector(*location), _directions[direction])
+                     for location, direction in zip(snapshot.locations, snapshot.directions)],
+                    snapshot.speed)
+        snake.length_change = snapshot.length_change
+        return snake
+
     def eat_food(self, food: Food):
         self.speed *= food.speed_change
         self.length_change += food.length_change
@@ -94,90 +148,468 @@ class Snake:
 
     def __iter__(self):
         """Итератор для змейки пробегающий от головы до хвоста"""
-        snake = []
-        for part in self.body:
-            snake.append(part)
-        return iter(snake[::-1])
+        return reversed(self.body)
+
+    def __reversed__(self):
+        """Итератор для змейки пробегающий от хвоста до головы"""
+        return iter(self.body)
 
     def __len__(self):
         return len(self.body)
 
 
 class Field:
-    def __init__(self, snake: Snake, walls: set, size_field: tuple):
+    # Коды клеток сетки занятости. Тело змейки хранится счётчиком
+    # (кратным BODY), поэтому наложение частей тела не теряется
+    EMPTY = 0
+    WALL = 1
+    FOOD = 2
+    BODY = 4
+
+    # Еда появляется только там, куда голова основной змейки может дойти
+    # в обход стен и тела (на арене с несколькими змейками отключается)
+    reachable_food = True
+
+    def __init__(self, snake: Snake, walls: set, size_field: tuple, regions: tuple = None):
+        """
+        :param regions: связные области клеток без стен, как из label_regions
+        (CompiledMap.regions); если не заданы, считаются по стенам
+        """
         self.foods_location = {}
-        self.snake = snake
         self.walls = walls
         self.width, self.height = size_field
+        self.random = random.Random()
+
+        self.cells = [self.EMPTY] * (self.width * self.height)
+        for location in walls:
+            self.cells[self.index(location)] |= self.WALL
+
+        self._snake = None
+        # Индексы изменившихся клеток для track_changes (None - никто не следит)
+        self._changes = None
+        # Тело могло разрезать область головы на части; сбрасывается, когда обход
+        # показал, что клетки области без стен и тела связны между собой
+        self._maybe_cut = True
+        # Если не связны - запомненный обход (_reach): (отметки, номер части головы, 0 - любая)
+        self._reached = None
+        if regions is None:
+            self._index_regions()
+        else:
+            self._region, self._regions_count = regions
+        self.reindex()
+        self.snake = snake
+
+    def index(self, location: Vector) -> int:
+        """Индекс клетки `location` в сетке занятости"""
+        return location.y * self.width + location.x
+
+    def cell_location(self, index: int) -> Vector:
+        """Клетка по её индексу в сетке занятости"""
+        return Vector(index % self.width, index // self.width)
+
+    def _neighbours(self, index: int) -> tuple:
+        """Соседние по сторонам клетки с переходом через края поля, как в Snake.step"""
+        width = self.width
+        x = index % width
+        row = index - x
+        return ((index - width) % len(self.cells), (index + width) % len(self.cells),
+                row + (x + 1) % width, row + (x - 1) % width)
+
+    def _flood(self, start: int, blocked: int, mark, value: int = 1):
+        """
+        Обход из `start` по соседям (как в _neighbours): клетки, где mark[index] ложно,
+        а в коде клетки нет битов `blocked`, получают mark[index] = value
+        """
+        flood_fill(self.cells, self.width, start, blocked, mark, value)
+
+    def _index_regions(self):
+        """
+        Связные области клеток без стен (номера с 1, 0 - стена). Для карт уровней берутся
+        из скомпилированной карты, считаются здесь только для полей без неё и в add_wall:
+        свободные клетки индексируются по областям, и еда выбирается из области головы
+        """
+        self._region, self._regions_count = label_regions(self.cells, self.width, self.WALL)
 
-        self.not_walls_cells = set()
-        for x in range(self.width):
-            for y in range(self.height):
-                point = Vector(x, y)
-                if point not in walls:
-                    self.not_walls_cells.add(point)
+    def reindex(self):
+        """
+        Перестроить индекс свободных клеток по порядку клеток, как у нового поля,
+        чтобы случайный выбор клетки зависел только от зерна генератора
+        """
+        snake = self._snake
+        if snake is not None:
+            self.lift_snake(snake)
+
+        self._set_free_cells(index for index, cell in enumerate(self.cells) if cell == self.EMPTY)
+
+        if snake is not None:
+            self.place_snake(snake)
+
+    def _set_free_cells(self, order):
+        # Индекс свободных клеток: по массиву на область с удалением через swap
+        # и позиция каждой клетки в массиве своей области (-1, если клетка занята)
+        region = self._region
+        # у стен (область 0) свободных клеток не бывает
+        region_free = [[] for _ in range(self._regions_count + 1)]
+        free_position = [-1] * len(self.cells)
+        for index in order:
+            free = region_free[region[index]]
+            free_position[index] = len(free)
+            free.append(index)
+        self._region_free = region_free
+        self._free_position = free_position
+        self._free_count = sum(map(len, region_free))
+
+    def _add_free(self, index: int):
+        free = self._region_free[self._region[index]]
+        self._free_position[index] = len(free)
+        free.append(index)
+        self._free_count += 1
+
+    def _take_free(self, index: int):
+        free = self._region_free[self._region[index]]
+        position = self._free_position[index]
+        last = free.pop()
+        if last != index:
+            free[position] = last
+            self._free_position[last] = position
+        self._free_position[index] = -1
+        self._free_count -= 1
+
+    def _change_cell(self, index: int, value: int):
+        was_free = self.cells[index] == self.EMPTY
+        self.cells[index] = value
+        if self._changes is not None:
+            self._changes.add(index)
+        if was_free and value != self.EMPTY:
+            self._take_free(index)
+        elif not was_free and value == self.EMPTY:
+            self._add_free(index)
+
+    def track_changes(self) -> set:
+        """
+        Множество индексов клеток, код которых менялся (змейка, еда, стены).
+        Пополняется с первого вызова, очищает его забирающий изменения
+        (инкрементальная отрисовка)
+        """
+        if self._changes is None:
+            self._changes = set()
+        return self._changes
 
-    def is_crash(self):
-        return self.snake.check_intersection(self.walls)
+    @property
+    def free_cells_count(self) -> int:
+        return self._free_count
+
+    @property
+    def free_cells(self) -> list:
+        """Индексы свободных клеток в том порядке, в котором из них выбирается случайная"""
+        return [index for free in self._region_free for index in free]
+
+    def restore_free_cells(self, order):
+        """Задать порядок индекса свободных клеток (например, из сохранения)"""
+        if not isinstance(order, list):
+            order = list(order)
+        # все клетки order свободны, повторов нет и их столько же, сколько свободных
+        if (len(order) != self._free_count
+                or any(map(self.cells.__getitem__, order))
+                or len(set(order)) != len(order)):
+            raise ValueError('Набор свободных клеток не совпадает с полем')
+        self._set_free_cells(order)
+
+    @property
+    def snake(self) -> Snake:
+        return self._snake
+
+    @snake.setter
+    def snake(self, snake: Snake):
+        if self._snake is not None:
+            self.lift_snake(self._snake)
+        self._snake = snake
+        self.place_snake(snake)
+
+    def place_snake(self, snake: Snake):
+        """Отметить тело змейки в сетке занятости (для змеек помимо основной)"""
+        self._maybe_cut = True
+        self._reached = None
+        for part in snake:
+            index = self.index(part.location)
+            self._change_cell(index, self.cells[index] + self.BODY)
+
+    def lift_snake(self, snake: Snake):
+        """Убрать тело змейки из сетки занятости"""
+        self._reached = None
+        for part in snake:
+            index = self.index(part.location)
+            self._change_cell(index, self.cells[index] - self.BODY)
+
+    def add_wall(self, location: Vector):
+        self.walls.add(location)
+        index = self.index(location)
+        self._change_cell(index, self.cells[index] | self.WALL)
+        order = self.free_cells
+        self._index_regions()
+        self._set_free_cells(order)
+        self._maybe_cut = True
+        self._reached = None
+
+    def step_snake(self, direction: Direction = None, snake: Snake = None):
+        """
+        Шаг змейки с обновлением сетки занятости (голова вошла, хвост вышел)
+        :param snake: змейка, отмеченная на поле; по умолчанию основная
+        """
+        if snake is None:
+            snake = self._snake
+        freed = []
+        for part in snake.step(direction, (self.width, self.height)):
+            index = self.index(part.location)
+            self._change_cell(index, self.cells[index] - self.BODY)
+            if self._passable(index):
+                freed.append(index)
+        index = self.index(snake.head.location)
+        entered = self._passable(index)
+        self._change_cell(index, self.cells[index] + self.BODY)
+        if self.reachable_food and snake is self._snake:
+            self._track_cut(index, entered, freed)
+        else:
+            self._maybe_cut = True
+            self._reached = None
+
+    def _track_cut(self, head: int, entered: bool, freed: list):
+        """
+        Обновить _maybe_cut и запомненный обход после шага основной змейки без нового обхода
+        :param entered: клетка `head`, куда вошла голова, до шага была проходима
+        :param freed: ставшие проходимыми клетки, которые освободил хвост
+        """
+        if not self._maybe_cut:
+            # область остаётся связной, если голова её не разрезала,
+            # а каждая освободившаяся клетка примыкает к проходимой
+            if entered:
+                self._maybe_cut = (self._may_cut(head)
+                                   or not all(any(map(self._passable, self._neighbours(index)))
+                                              for index in freed))
+            return
+        if self._reached is None:
+            return
+        # Голова ушла в соседнюю клетку своей части; если та не разрезала часть, достижима
+        # остаётся только эта часть (кроме клетки головы) и примкнувшие к ней клетки хвоста,
+        # а клетки хвоста вне части отмечаются нулём
+        reached, _ = self._reached
+        self._reached = None
+        if not entered or head in freed or self._may_cut(head):
+            return
+        value = reached[head]
+        for index in freed:
+            reached[index] = 0
+        for index in freed:
+            neighbours = self._neighbours(index)
+            marks = {reached[neighbour] for neighbour in neighbours if self._passable(neighbour)}
+            if value in marks or head in neighbours:
+                if marks != {value}:
+                    # клетка хвоста соединила часть головы с другой частью или клеткой
+                    return
+                reached[index] = value
+        self._reached = reached, value
+
+    def _passable(self, index: int) -> bool:
+        cell = self.cells[index]
+        return cell < self.BODY and not cell & self.WALL
+
+    def _may_cut(self, index: int) -> bool:
+        """
+        Может ли тело в клетке `index` отрезать часть области: проходимые соседи по сторонам
+        не связаны между собой через восемь клеток вокруг неё
+        """
+        width, height = self.width, self.height
+        if width < 3 or height < 3:
+            return True
+        x, y = index % width, index // width
+        # по кругу с севера, соседи по сторонам - на чётных местах
+        ring = [self._passable((y + dy) % height * width + (x + dx) % width)
+                for dx, dy in ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))]
+        # число связных по кругу участков, в которых есть сосед по стороне
+        runs = sum(1 for k in range(0, 8, 2) if ring[k] and not (ring[k - 1] and ring[k - 2]))
+        return runs > 1
+
+    def is_crash(self, snake: Snake = None):
+        """Голова змейки в стене или в клетке, где есть ещё чьё-то тело"""
+        if snake is None:
+            snake = self._snake
+        cell = self.cells[self.index(snake.head.location)]
+        return bool(cell & self.WALL) or cell >= 2 * self.BODY
+
+    def random_free_cell(self) -> Vector:
+        if not self._free_count:
+            raise IndexError('Нет свободных клеток')
+        position = self.random.randrange(self._free_count)
+        for free in self._region_free:
+            if position < len(free):
+                return self.cell_location(free[position])
+            position -= len(free)
+
+    def random_reachable_cell(self) -> Vector:
+        """
+        Случайная свободная клетка, до которой голова основной змейки может дойти
+        в обход стен и тела; если таких нет - любая свободная.
+        Обычно это выбор из свободных клеток области головы, а обход
+        нужен, только если тело с прошлой проверки могло что-то отрезать
+        """
+        head = self.index(self._snake.head.location)
+        region = self._region[head]
+        if not region or not self._region_free[region]:
+            return self.random_free_cell()
+        free = self._region_free[region]
+        if self._maybe_cut and self._reached is None:
+            self._reach(head, region)
+        if self._maybe_cut:
+            reached, value = self._reached
+            if value:
+                free = [index for index in free if reached[index] == value]
+            else:
+                free = [index for index in free if reached[index]]
+            if not free:
+                return self.random_free_cell()
+        return self.cell_location(self.random.choice(free))
+
+    def _reach(self, head: int, region: int):
+        """
+        Обход от каждого проходимого соседа головы: клетки, достижимые от разных соседей
+        без прохода через голову, получают разные номера. Если от первого же соседа
+        достижима вся область, она связна и без головы; иначе обход запоминается
+        до шага, после которого _track_cut не может его обновить
+        """
+        reached = bytearray(len(self.cells))
+        reached[head] = 255
+        neighbours = [index for index in self._neighbours(head) if self._passable(index)]
+        for number, neighbour in enumerate(neighbours, 1):
+            if not reached[neighbour]:
+                self._flood(neighbour, ~self.FOOD, reached, number)
+            if number == 1 and self._all_reached(reached, region):
+                self._maybe_cut = False
+                return
+        self._reached = reached, 0
+
+    def _all_reached(self, reached: bytearray, region: int) -> bool:
+        """Все свободные клетки и еда области `region` отмечены в `reached`"""
+        return (all(map(reached.__getitem__, self._region_free[region]))
+                and all(reached[index] for index in map(self.index, self.foods_location)
+                        if self._region[index] == region))
 
     def generate_food(self, food: Food = Food()):
-        loc = set([e.location for e in self.snake.body]).union(self.foods_location.keys())
-        empty_cells = self.not_walls_cells - loc
-        location = random.choice(list(empty_cells))
-        self.foods_location[location] = food
+        location = self.random_reachable_cell() if self.reachable_food else self.random_free_cell()
+        self.add_food(location, food)
 
         return location
 
-    def eat_food(self, location: Vector = None) -> float:
+    def add_food(self, location: Vector, food: Food):
+        index = self.index(location)
+        self.foods_location[location] = food
+        self._change_cell(index, self.cells[index] | self.FOOD)
+
+    def remove_food(self, location: Vector) -> Food:
+        index = self.index(location)
+        self._change_cell(index, self.cells[index] & ~self.FOOD)
+        return self.foods_location.pop(location)
+
+    def snapshot(self) -> FieldSnapshot:
+        return FieldSnapshot(self._snake.snapshot(),
+                             tuple((location.x, location.y, food)
+                                   for location, food in self.foods_location.items()))
+
+    def restore(self, snapshot: FieldSnapshot):
+        """Вернуть змейку и еду из снимка; стены и размеры поля не меняются"""
+        for location in list(self.foods_location):
+            self.remove_food(location)
+        for x, y, food in snapshot.foods:
+            self.add_food(Vector(x, y), food)
+        self.snake = Snake.from_snapshot(snapshot.snake)
+
+    def eat_food(self, location: Vector = None, snake: Snake = None) -> float:
         """
         :return: score
         """
+        if snake is None:
+            snake = self._snake
         if location is None:
-            location = self.snake.head.location
-        self.snake.eat_food(self.foods_location[location])
-        food = self.foods_location.pop(location)
+            location = snake.head.location
+        snake.eat_food(self.foods_location[location])
+        food = self.remove_food(location)
         return food.score
 
 
 class Level:
     @staticmethod
     def parse_map(map_path: str) -> (Field, int):
-        walls = set()
-        with open(map_path, 'r', encoding='utf-8') as mfd:
-            lines = mfd.read().split('\n')
-            width_field = 0
-            height_field = len(lines) - 5
-            for i in range(height_field):
-                for j in range(len(lines[i])):
-                    if len(lines[i]) > width_field:
-                        width_field = len(lines[i])
-                    if lines[i][j] == settings.wall_symbol:
-                        walls.add(Vector(j, i))
-
-            snake_dir = TranslateDirection.word_dir[lines[-5]]
-            snake = []
-            for i in range(-4, -1):
-                location = tuple(map(int, lines[i].split(' ')))
-                snake_part = SnakePart(Vector(*location), snake_dir)
-                snake.append(snake_part)
-            max_score = int(lines[-1])
-
-        field = Field(Snake(snake), walls, (width_field, height_field))
-        return field, max_score
-
-    def __init__(self, level_name, health):
+        compiled = CompiledMap.load(map_path)
+        walls = {Vector(index % compiled.width, index // compiled.width)
+                 for index in compiled.wall_indexes()}
+        snake = [SnakePart(Vector(*location), compiled.direction)
+                 for location in compiled.snake]
+
+        field = Field(Snake(snake), walls, (compiled.width, compiled.height), compiled.regions)
+        return field, compiled.max_score
+
+    # Заполняются из настроек в _apply_settings
+    not_basic_food = []
+    bonus_food = []
+
+    def __init__(self, level_name, health, seed=None, timed_food=True):
+        """
+        :param seed: зерно генератора случайных чисел уровня (для воспроизводимых игр)
+        :param timed_food: бонусная еда появляется и исчезает сама по шагам (FoodSpawner);
+        иначе - только через spawn_bonus_food, как в записях первой версии
+        """
         self.win_flag = False
         self.game_over_flag = False
         self.name = level_name
         self.health = health
+        self.random = random.Random(seed)
         (self.field, self.max_score) = self.parse_map(settings.map_file(level_name))
+        self.field.random = self.random
+        self.bonus_food_location = None
+        self.steps = 0
+        self.food_spawner = (FoodSpawner(self.field, self.random, self.bonus_food,
+                                         settings.bonus_food_period, settings.bonus_food_max)
+                             if timed_food else None)
         self.field.generate_food()
-        self.old_snake = deepcopy(self.field.snake)
+        self.start_snake = self.field.snake.snapshot()
         self.score = 0
 
+    @property
+    def finished(self) -> bool:
+        """Игра на уровне окончена (при max_score = 0 победы нет, как в свободной игре)"""
+        return self.game_over_flag or (self.win_flag and self.max_score > 0)
+
+    def restart(self, health, seed=None):
+        """
+        Начать уровень заново без повторного чтения карты:
+        состояние такое же, как у Level(self.name, health, seed)
+        """
+        self.restore(LevelSnapshot(FieldSnapshot(self.start_snake, ()), 0, health, False, False))
+        self.field.reindex()
+        self.random.seed(seed)
+        self.field.generate_food()
+
     def reset(self):
         self.score = 0
-        self.field.snake = deepcopy(self.old_snake)
+        self.field.snake = Snake.from_snapshot(self.start_snake)
+
+    def snapshot(self) -> LevelSnapshot:
+        return LevelSnapshot(self.field.snapshot(), self.score, self.health,
+                             self.win_flag, self.game_over_flag, self.steps, self.bonus_food_location,
+                             self.food_spawner.state() if self.food_spawner is not None else None)
+
+    def restore(self, snapshot: LevelSnapshot):
+        self.field.restore(snapshot.field)
+        self.score = snapshot.score
+        self.health = snapshot.health
+        self.win_flag = snapshot.win_flag
+        self.game_over_flag = snapshot.game_over_flag
+        self.steps = snapshot.steps
+        self.bonus_food_location = snapshot.bonus_food_location
+        if self.food_spawner is not None:
+            if snapshot.food_spawner is None:
+                self.food_spawner.reset(snapshot.steps)
+            else:
+                self.food_spawner.set_state(*snapshot.food_spawner)
 
     def lose(self):
         self.health -= 1
@@ -187,10 +619,13 @@ class Level:
             self.reset()
 
     def eat_food(self):
-        self.score += self.field.eat_food()
+        location = self.field.snake.head.location
+        self.score += self.field.eat_food(location)
+        if self.food_spawner is not None:
+            self.food_spawner.eaten(location)
 
     def step_snake(self, direction: Direction = None):
-        self.field.snake.step(direction, (self.field.width, self.field.height))
+        self.field.step_snake(direction)
         if self.field.is_crash() or len(self.field.snake) <= 1:
             self.lose()
         if self.field.snake.head.location in self.field.foods_location:
@@ -199,3 +634,29 @@ class Level:
             self.eat_food()
         if self.score >= self.max_score:
             self.win_flag = True
+
+    def play_step(self, direction: Direction = None):
+        """Шаг игры: шаг змейки, сроки бонусной еды и пополнение еды, если её осталось мало"""
+        self.step_snake(direction)
+        self.steps += 1
+        if self.food_spawner is not None:
+            self.food_spawner.update(self.steps)
+        if len(self.field.foods_location) <= 1:
+            self.field.generate_food()
+
+    def spawn_bonus_food(self):
+        """Заменить бонусную еду новой случайного вида"""
+        if self.bonus_food_location in self.field.foods_location:
+            self.field.remove_food(self.bonus_food_location)
+        self.bonus_food_location = \
+            self.field.generate_food(self.random.choice(self.not_basic_food))
+
+
+@Settings.on_reload
+def _apply_settings(settings: Settings):
+    """Виды еды Level из настроек"""
+    Level.not_basic_food = [Food(*t) for t in settings.not_basic_food]
+    Level.bonus_food = [(Food(*food), weight, lifetime) for food, weight, lifetime in settings.bonus_food]
+
+
+_apply_settings(settings)
@@ -0,0 +1,93 @@
+"""Появление и исчезновение бонусной еды по шагам симуляции"""
+import heapq
+from itertools import accumulate
+
+__all__ = ['FoodSpawner']
+
+
+class FoodSpawner:
+    """
+    Расписание бонусной еды в куче сроков (номер шага):
+    каждые `period` шагов появляется еда случайного вида с учётом весов,
+    если её на поле меньше `max_count`, и каждая исчезает через время жизни своего вида.
+    Пока срок не наступил, update только сравнивает номер шага с вершиной кучи.
+
+    Элемент кучи - (срок, порядковый номер, клетка, вид); клетка None - появление еды.
+    Съеденная еда из кучи не удаляется: её срок просто пропускается.
+    """
+
+    def __init__(self, field, random, types, period: int, max_count: int):
+        """
+        :param field: Field, на которое кладётся еда
+        :param random: генератор уровня (random.Random)
+        :param types: [(Food, вес, время жизни в шагах, 0 - пока не съедят)]
+        """
+        self.field = field
+        self.random = random
+        self.foods = [food for food, _, _ in types]
+        self.lifetimes = [lifetime for _, _, lifetime in types]
+        self._cum_weights = list(accumulate(weight for _, weight, _ in types))
+        self._kinds = range(len(types))
+        self.period = period
+        self.max_count = max_count
+        self.reset()
+
+    def reset(self, now: int = 0):
+        """Убрать расписание; первая еда появится на шаге `now`"""
+        self._heap = [(now, 0, None, -1)]
+        self._active = {}
+        self._sequence = 1
+
+    @property
+    def active(self) -> dict:
+        """Лежащая на поле бонусная еда: клетка (Vector) -> порядковый номер"""
+        return self._active
+
+    def update(self, now: int):
+        """Обработать сроки, наступившие к шагу `now`"""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, sequence, location, kind = heapq.heappop(heap)
+            if location is None:
+                self._spawn(deadline)
+                self._push(deadline + self.period, None, -1)
+            elif self._active.get(location) == sequence:
+                del self._active[location]
+                if self.field.foods_location.get(location) == self.foods[kind]:
+                    self.field.remove_food(location)
+
+    def eaten(self, location):
+        """Еду в клетке `location` съели"""
+        self._active.pop(location, None)
+
+    def _push(self, deadline: int, location, kind: int) -> int:
+        sequence = self._sequence
+        self._sequence += 1
+        heapq.heappush(self._heap, (deadline, sequence, location, kind))
+        return sequence
+
+    def _spawn(self, now: int):
+        if (len(self._active) >= self.max_count or not self.foods
+                or not self.field.free_cells_count):
+            return
+        kind = self.random.choices(self._kinds, cum_weights=self._cum_weights)[0]
+        location = self.field.generate_food(self.foods[kind])
+        lifetime = self.lifetimes[kind]
+        if lifetime:
+            self._active[location] = self._push(now + lifetime, location, kind)
+        else:
+            self._active[location] = self._sequence
+            self._sequence += 1
+
+    def state(self) -> tuple:
+        """
+        Неизменяемое состояние для снимков и сохранений: (следующий порядковый номер,
+        элементы кучи, пары (клетка, порядковый номер) из active)
+        """
+        return self._sequence, tuple(self._heap), tuple(self._active.items())
+
+    def set_state(self, sequence: int, heap, active):
+        self._sequence = sequence
+        self._heap = list(heap)
+        heapq.heapify(self._heap)
+        self._active = dict(active)
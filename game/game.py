@@ -1,69 +1,136 @@
+import os
 import random
 
-from game.entities import Food, Level
+from game.entities import Level
 from game.direction import *
 from game.drawing.windows import *
 from game.drawing.game_drawing import *
 from game.settings import Settings
+from game.service_entities.scheduler import Scheduler
+from game.replay import GameRecord
+from game.autopilot import Autopilot
+from game.service_entities.profiler import Profiler
+from game.drawing.overlay import ProfilerOverlay
 import pygame
-pygame.init()
 
-settings = Settings()
+settings = Settings.get()
 
 
 class Game:
-    clock = pygame.time.Clock()
-    fps = 120
-
-    _generate_food_location = None
-
-    @staticmethod
-    def _get_direction():
-        for i in pygame.event.get():
+    # Клавиши управления змейкой; ввод живёт только в слое отрисовки,
+    # чтобы симуляция (game.entities) не зависела от pygame
+    key_direction = {
+        pygame.K_RIGHT: Direction.RIGHT,
+        pygame.K_LEFT: Direction.LEFT,
+        pygame.K_UP: Direction.UP,
+        pygame.K_DOWN: Direction.DOWN
+    }
+
+    def __init__(self, record_dir=None, profile_overlay=False, profile_path=None, autopilot=False):
+        """
+        :param record_dir: папка, куда сохраняются записи сыгранных уровней
+        :param profile_overlay: показывать время фаз кадра поверх игры
+        :param profile_path: файл, куда после каждого уровня пишется статистика фаз (JSON)
+        :param autopilot: змейкой управляет Autopilot, а не клавиатура
+        """
+        pygame.init()
+        self.input_buffer = DirectionBuffer()
+        self.autopilot = Autopilot() if autopilot else None
+        self.record_dir = record_dir
+        self.record = None
+        self.profiler = Profiler(enabled=profile_overlay or profile_path is not None)
+        self.profile_overlay = profile_overlay
+        self.profile_path = profile_path
+        self.overlay = None
+
+    def _get_direction(self, level: Level):
+        """Переносит нажатия в буфер поворотов и возвращает поворот для этого шага"""
+        with self.profiler.phase('events'):
+            events = pygame.event.get()
+        for i in events:
             if i.type == pygame.QUIT:
                 exit()
             elif i.type == pygame.KEYDOWN:
-                if i.key in TranslateDirection.direction:
-                    return TranslateDirection.direction[i.key]
+                if i.key in self.key_direction:
+                    self.input_buffer.push(self.key_direction[i.key],
+                                           level.field.snake.head.direction)
+        if self.autopilot is not None:
+            return self.autopilot.direction(level.field)
+        return self.input_buffer.pop()
+
+    def _create_scheduler(self, level: Level) -> Scheduler:
+        self.input_buffer.clear()
+        scheduler = Scheduler()
+        scheduler.every('step', lambda: 1 / level.field.snake.speed)
+        return scheduler
+
+    def _create_level(self, name, health) -> Level:
+        if self.record_dir is None:
+            return Level(name, health)
+        seed = random.getrandbits(63)
+        self.record = GameRecord(name, health, seed)
+        return Level(name, health, seed)
+
+    def _start_drawing(self, level_drawing: GameDrawing):
+        self.overlay = (ProfilerOverlay(level_drawing.surface, self.profiler)
+                        if self.profile_overlay
+                        else None)
+
+    def _finish_level(self):
+        if self.record is not None:
+            os.makedirs(self.record_dir, exist_ok=True)
+            self.record.save(os.path.join(self.record_dir,
+                                          f'{self.record.level_name}-{self.record.seed}.snr'))
+            self.record = None
+        if self.profile_path is not None:
+            self.profiler.dump(self.profile_path)
 
     def free_game_loop(self):
-        level = Level('free', 1)
-        tick = 0
+        level = self._create_level('free', 1)
         level_drawing = FreeGameDrawing(level)
-        while not level.game_over_flag:
-            self.clock.tick(self.fps)
-            self.step_game(level, tick, level_drawing)
-            tick += 1
+        self._start_drawing(level_drawing)
+        scheduler = self._create_scheduler(level)
+        while not level.finished:
+            self.step_game(level, scheduler.update(), level_drawing)
+            scheduler.wait()
+        self._finish_level()
         return level.score
 
     def level_game_loop(self, name, health, level_number, total_number_levels):
-        level = Level(name, health)
-        tick = 0
+        level = self._create_level(name, health)
         level_drawing = LevelDrawing(level, level_number, total_number_levels)
-        while not level.win_flag and not level.game_over_flag:
-            self.clock.tick(self.fps)
-            self.step_game(level, tick, level_drawing)
-            tick += 1
+        self._start_drawing(level_drawing)
+        scheduler = self._create_scheduler(level)
+        while not level.finished:
+            self.step_game(level, scheduler.update(), level_drawing)
+            scheduler.wait()
+        self._finish_level()
         return level.health
 
-    not_basic_food = [Food(*t) for t in settings.not_basic_food]
-
-    def step_game(self, level: Level, tick, level_drawing: GameDrawing):
-        tick_move = self.fps // level.field.snake.speed
-        if not tick_move or not tick % tick_move:
-            level.step_snake(self._get_direction())
-            if len(level.field.foods_location) <= 1:
-                level.field.generate_food()
-            level_drawing.draw()
-            pygame.display.flip()
-
-        if not (tick - 1) % (self.fps * 5):
-            if self._generate_food_location in level.field.foods_location:
-                level.field.foods_location.pop(self._generate_food_location)
-            self._generate_food_location = \
-                level.field.generate_food(random.choice(self.not_basic_food))
-            level_drawing.draw()
-            pygame.display.flip()
+    def step_game(self, level: Level, events: list, level_drawing: GameDrawing):
+        """
+        :param events: наступившие события планировщика ('step');
+        бонусную еду выставляет сам уровень по шагам
+        """
+        for event in events:
+            if level.finished:
+                break
+            if event == 'step':
+                direction = self._get_direction(level)
+                with self.profiler.phase('step'):
+                    level.play_step(direction)
+                if self.record is not None:
+                    self.record.add_step(direction)
+
+        if events:
+            dirty = [self.overlay.restore()] if self.overlay is not None else []
+            with self.profiler.phase('draw'):
+                dirty += level_drawing.draw()
+            if self.overlay is not None:
+                dirty.append(self.overlay.draw())
+            with self.profiler.phase('display'):
+                pygame.display.update(dirty)
+            self.profiler.frame()
 
     def main_loop(self):
         windows = {
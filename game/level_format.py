@@ -0,0 +1,196 @@
+"""Скомпилированный формат карт уровней с кэшем на диске"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from game.direction import Direction, TranslateDirection
+from game.settings import Settings
+
+__all__ = ['CompiledMap', 'flood_fill', 'label_regions']
+
+settings = Settings.get()
+
+# Для каждого байта битовой карты - 8 байт с кодами клеток (1 - стена)
+_BYTE_CELLS = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+
+def flood_fill(cells, width: int, start: int, blocked: int, mark, value: int = 1):
+    """
+    Обход из `start` по соседним по сторонам клеткам с переходом через края поля, как в Snake.step:
+    клетки, где mark[index] ложно, а в cells[index] нет битов `blocked`, получают mark[index] = value
+    """
+    size = len(cells)
+    mark[start] = value
+    stack = [start]
+    while stack:
+        index = stack.pop()
+        x = index % width
+        row = index - x
+        for neighbour in ((index - width) % size, (index + width) % size,
+                          row + (x + 1) % width, row + (x - 1) % width):
+            if not mark[neighbour] and not cells[neighbour] & blocked:
+                mark[neighbour] = value
+                stack.append(neighbour)
+
+
+def label_regions(cells, width: int, blocked: int = 1) -> (list, int):
+    """
+    Связные области клеток без битов `blocked` (по умолчанию - без стен)
+    :return: (номер области каждой клетки с 1, 0 - стена; число областей)
+    """
+    regions = [0] * len(cells)
+    count = 0
+    for start, cell in enumerate(cells):
+        if not cell & blocked and not regions[start]:
+            count += 1
+            flood_fill(cells, width, start, blocked, regions, count)
+    return regions, count
+
+
+class CompiledMap:
+    """
+    Карта уровня: битовая карта стен, связные области клеток без стен (label_regions),
+    начальная змейка, её направление и очки для победы.
+
+    Формат файла (little-endian): заголовок _header, затем координаты змейки
+    от головы к хвосту (по два uint32), битовая карта стен, клетка y * width + x
+    хранится в бите (index % 8) байта index // 8, и с границы 4 байт - номера областей
+    клеток (uint32).
+    """
+
+    _magic = b'SNKL'
+    _version = 2
+    # magic, version, width, height, direction, snake_length, max_score,
+    # regions_count, source_mtime, source_size
+    _header = struct.Struct('<4sHIIBHiIqq')
+
+    def __init__(self, width: int, height: int, walls: bytes, snake: list,
+                 direction: Direction, max_score: int, regions: tuple = None):
+        """
+        :param walls: по байту на клетку y * width + x, 1 - стена
+        :param snake: list[(x, y)], от головы к хвосту
+        :param regions: результат label_regions для walls; по умолчанию считается
+        """
+        self.width = width
+        self.height = height
+        self.walls = walls
+        self.snake = snake
+        self.direction = direction
+        self.max_score = max_score
+        self.regions = regions if regions is not None else label_regions(walls, width)
+
+    @classmethod
+    def from_text(cls, map_path: str):
+        """Разбор map.txt"""
+        with open(map_path, 'r', encoding='utf-8') as mfd:
+            lines = mfd.read().split('\n')
+
+        height = len(lines) - 5
+        width = max((len(line) for line in lines[:height]), default=0)
+        walls = bytearray(width * height)
+        for i in range(height):
+            for j, symbol in enumerate(lines[i]):
+                if symbol == settings.wall_symbol:
+                    walls[i * width + j] = 1
+
+        direction = TranslateDirection.word_dir[lines[-5]]
+        snake = [tuple(map(int, lines[i].split(' '))) for i in range(-4, -1)]
+        max_score = int(lines[-1])
+        return cls(width, height, bytes(walls), snake, direction, max_score)
+
+    def wall_indexes(self):
+        """Индексы клеток со стенами"""
+        index = self.walls.find(1)
+        while index != -1:
+            yield index
+            index = self.walls.find(1, index + 1)
+
+    def to_bytes(self, source_mtime: int = 0, source_size: int = 0) -> bytes:
+        size = self.width * self.height
+        walls = self.walls + bytes(-size % 8)
+        bitmap = bytes(sum(walls[i + bit] << bit for bit in range(8))
+                       for i in range(0, len(walls), 8))
+        labels, count = self.regions
+        header = self._header.pack(self._magic, self._version,
+                                   self.width, self.height,
+                                   self.direction.value, len(self.snake),
+                                   self.max_score, count, source_mtime, source_size)
+        snake = struct.pack(f'<{2 * len(self.snake)}I',
+                            *(coordinate for part in self.snake for coordinate in part))
+        regions = array('I', labels)
+        if sys.byteorder == 'big':
+            regions.byteswap()
+        return header + snake + bitmap + bytes(-len(bitmap) % 4) + regions.tobytes()
+
+    @classmethod
+    def _unpack_header(cls, buffer):
+        if len(buffer) < cls._header.size:
+            return None
+        header = cls._header.unpack_from(buffer)
+        if header[0] != cls._magic or header[1] != cls._version:
+            return None
+        return header
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Чтение из bytes или mmap"""
+        header = cls._unpack_header(buffer)
+        if header is None:
+            raise ValueError('Неизвестный формат скомпилированной карты')
+        _, _, width, height, direction, snake_length, max_score, regions_count, _, _ = header
+
+        offset = cls._header.size
+        coordinates = struct.unpack_from(f'<{2 * snake_length}I', buffer, offset)
+        snake = list(zip(coordinates[::2], coordinates[1::2]))
+
+        offset += 8 * snake_length
+        size = width * height
+        bitmap = buffer[offset:offset + (size + 7) // 8]
+        walls = b''.join(map(_BYTE_CELLS.__getitem__, bitmap))[:size]
+
+        offset += len(bitmap) + (-len(bitmap) % 4)
+        labels = array('I')
+        labels.frombytes(buffer[offset:offset + 4 * size])
+        if len(labels) != size:
+            raise ValueError('Неполная скомпилированная карта')
+        if sys.byteorder == 'big':
+            labels.byteswap()
+        return cls(width, height, walls, snake, Direction(direction), max_score,
+                   (labels.tolist(), regions_count))
+
+    @staticmethod
+    def cache_path(map_path: str) -> str:
+        """Файл кэша для карты `map_path`"""
+        name = hashlib.sha1(os.path.abspath(map_path).encode('utf-8')).hexdigest()
+        return os.path.join(settings.levels_cache_dir, name + '.bin')
+
+    @classmethod
+    def load(cls, map_path: str):
+        """
+        Скомпилированная карта из кэша; если кэша нет или map.txt изменился
+        (по mtime и размеру), карта компилируется заново и кэш перезаписывается
+        """
+        stat = os.stat(map_path)
+        cache_path = cls.cache_path(map_path)
+        try:
+            with open(cache_path, 'rb') as cfd, \
+                    mmap.mmap(cfd.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                header = cls._unpack_header(buffer)
+                if header is not None and header[-2:] == (stat.st_mtime_ns, stat.st_size):
+                    return cls.from_buffer(buffer)
+        except (OSError, ValueError, struct.error):
+            pass
+
+        compiled = cls.from_text(map_path)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as cfd:
+                cfd.write(compiled.to_bytes(stat.st_mtime_ns, stat.st_size))
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+        return compiled
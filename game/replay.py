@@ -0,0 +1,119 @@
+"""Запись игр и их воспроизведение без отрисовки"""
+import argparse
+import struct
+import time
+
+from game.direction import Direction
+from game.entities import Level
+
+__all__ = ['GameRecord']
+
+_directions = tuple(Direction)
+
+
+class GameRecord:
+    """
+    Запись игры на одном уровне: зерно генератора, уровень, жизни
+    и по байту на событие игрового цикла.
+
+    Формат файла (little-endian): заголовок _header, имя уровня в utf-8
+    длиной из заголовка, затем события: 0-3 - шаг с поворотом (Direction.value),
+    NO_TURN - шаг без поворота, BONUS_FOOD - появление бонусной еды.
+
+    С версии 2 бонусную еду по шагам выставляет сам уровень (Level.food_spawner),
+    и событий BONUS_FOOD в записи нет; записи версии 1 играются без FoodSpawner.
+    """
+
+    NO_TURN = 4
+    BONUS_FOOD = 5
+
+    _magic = b'SNKR'
+    _version = 2
+    _header = struct.Struct('<4sHQBH')
+
+    def __init__(self, level_name: str, health: int, seed: int, events=b'', version: int = _version):
+        self.level_name = level_name
+        self.health = health
+        self.seed = seed
+        self.events = bytearray(events)
+        self.version = version
+
+    @property
+    def timed_food(self) -> bool:
+        """Бонусную еду выставляет уровень, а не события записи"""
+        return self.version >= 2
+
+    def add_step(self, direction: Direction = None):
+        self.events.append(self.NO_TURN if direction is None else direction.value)
+
+    def add_bonus_food(self):
+        self.events.append(self.BONUS_FOOD)
+
+    def to_bytes(self) -> bytes:
+        name = self.level_name.encode('utf-8')
+        return (self._header.pack(self._magic, self.version, self.seed, self.health, len(name))
+                + name + bytes(self.events))
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        if len(data) < cls._header.size:
+            raise ValueError('Неизвестный формат записи игры')
+        magic, version, seed, health, name_length = cls._header.unpack_from(data)
+        if magic != cls._magic or not 1 <= version <= cls._version:
+            raise ValueError('Неизвестный формат записи игры')
+        offset = cls._header.size
+        name = data[offset:offset + name_length].decode('utf-8')
+        return cls(name, health, seed, data[offset + name_length:], version)
+
+    def save(self, path: str):
+        with open(path, 'wb') as fd:
+            fd.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, 'rb') as fd:
+            return cls.from_bytes(fd.read())
+
+    def replay(self, on_event=None, level: Level = None) -> Level:
+        """
+        Проиграть запись через Level без отрисовки и задержек
+        :param on_event: вызывается с (level, event) после каждого события
+        :param level: уже загруженный уровень записи, который начинается заново
+        (если режим бонусной еды у него другой, создаётся новый)
+        :return: уровень в состоянии после последнего события
+        """
+        if level is None or (level.food_spawner is not None) != self.timed_food:
+            level = Level(self.level_name, self.health, self.seed, self.timed_food)
+        else:
+            level.restart(self.health, self.seed)
+        for event in self.events:
+            if level.finished:
+                break
+            if event == self.BONUS_FOOD:
+                level.spawn_bonus_food()
+            elif event == self.NO_TURN:
+                level.play_step()
+            else:
+                level.play_step(_directions[event])
+            if on_event is not None:
+                on_event(level, event)
+        return level
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Воспроизведение записанных игр')
+    parser.add_argument('records', nargs='+', help='файлы записей (.snr)')
+    options = parser.parse_args(args)
+
+    for path in options.records:
+        record = GameRecord.load(path)
+        start = time.perf_counter()
+        level = record.replay()
+        elapsed = time.perf_counter() - start
+        print(f'{path}: level={record.level_name} score={level.score} health={level.health} '
+              f'win={level.win_flag} game_over={level.game_over_flag} '
+              f'events={len(record.events)} time={elapsed:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
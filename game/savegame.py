@@ -0,0 +1,255 @@
+"""Сохранение и загрузка полного состояния уровня в двоичном виде"""
+import mmap
+import struct
+import sys
+from array import array
+
+from game.entities import *
+
+__all__ = ['SaveGame', 'CheckpointFile']
+
+
+def _pad(size: int) -> bytes:
+    return bytes(-size % 8)
+
+
+def _pack_cells(cells) -> bytes:
+    """Индексы клеток как uint32 little-endian"""
+    packed = array('I', cells)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_cells(data, offset: int, count: int) -> list:
+    cells = array('I')
+    cells.frombytes(data[offset:offset + 4 * count])
+    if sys.byteorder == 'big':
+        cells.byteswap()
+    return cells.tolist()
+
+
+class SaveGame:
+    """
+    Состояние уровня: счёт, жизни, флаги, змейка, еда, бонусная еда и её сроки,
+    порядок индекса свободных клеток и состояние генератора случайных чисел,
+    поэтому игра после загрузки продолжается так же, как без сохранения.
+    Стены не сохраняются, они берутся из карты уровня.
+
+    Формат (little-endian), каждая часть выровнена на 8 байт:
+    _header и имя уровня в utf-8; _state; змейка от головы к хвосту -
+    клетки y * width + x (uint32) и Direction.value (по байту);
+    еда (_food на каждую); свободные клетки (uint32);
+    генератор (_random и 625 uint32 из random.getstate());
+    сроки бонусной еды (_spawner, _deadline на элемент кучи, _active на лежащую еду).
+
+    Сохранения версии 1 (_state_v1, без сроков бонусной еды) загружаются
+    в уровень без FoodSpawner с нулевым числом шагов.
+    """
+
+    _magic = b'SNKS'
+    _version = 2
+    _header = struct.Struct('<4sHH')
+    # score, speed, health, win, game_over, timed_food (есть ли FoodSpawner),
+    # bonus_cell (клетка последней бонусной еды, даже съеденной; -1 - нет), width, height, snake_length, length_change, food_count, free_count, steps
+    _state = struct.Struct('<qdiBBBxiIIIiIII')
+    # как _state без timed_food и steps
+    _state_v1 = struct.Struct('<qdiBBxxiIIIiII4x')
+    # speed_change, cell, length_change, score
+    _food = struct.Struct('<dIii4x')
+    # gauss_next, есть ли gauss_next
+    _random = struct.Struct('<dB7x')
+    _random_words = struct.Struct('<625I')
+    # следующий порядковый номер, элементов кучи, лежащей еды
+    _spawner = struct.Struct('<III4x')
+    # срок, порядковый номер, клетка (-1 - появление еды), вид
+    _deadline = struct.Struct('<qIib7x')
+    # клетка, порядковый номер
+    _active = struct.Struct('<II')
+
+    @classmethod
+    def to_bytes(cls, level: Level) -> bytes:
+        field = level.field
+        snake = field.snake
+        name = level.name.encode('utf-8')
+        bonus = level.bonus_food_location
+        foods = field.foods_location
+        free_cells = field.free_cells
+        version, words, gauss = level.random.getstate()
+        spawner = level.food_spawner
+        sequence, heap, active = spawner.state() if spawner is not None else (0, (), ())
+
+        cells = [field.index(part.location) for part in snake]
+        directions = bytes(part.direction.value for part in snake)
+        parts = [
+            cls._header.pack(cls._magic, cls._version, len(name)), name, _pad(len(name)),
+            cls._state.pack(level.score, snake.speed, level.health,
+                            level.win_flag, level.game_over_flag, spawner is not None,
+                            field.index(bonus) if bonus is not None else -1,
+                            field.width, field.height, len(cells), snake.length_change,
+                            len(foods), len(free_cells), level.steps),
+            _pack_cells(cells), directions, _pad(5 * len(cells)),
+            b''.join(cls._food.pack(food.speed_change, field.index(location),
+                                    food.length_change, food.score)
+                     for location, food in foods.items()),
+            _pack_cells(free_cells), _pad(4 * len(free_cells)),
+            cls._random.pack(gauss or 0.0, gauss is not None),
+            cls._random_words.pack(*words), _pad(cls._random_words.size),
+            cls._spawner.pack(sequence, len(heap), len(active)),
+            b''.join(cls._deadline.pack(deadline, number,
+                                        field.index(location) if location is not None else -1, kind)
+                     for deadline, number, location, kind in heap),
+            b''.join(cls._active.pack(field.index(location), number)
+                     for location, number in active),
+        ]
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, level: Level = None) -> Level:
+        """
+        :param data: bytes или другой буфер (например, mmap)
+        :param level: уровень с той же картой, в который загружается состояние;
+        по умолчанию создаётся новый
+        """
+        if len(data) < cls._header.size:
+            raise ValueError('Неизвестный формат сохранения')
+        magic, version, name_length = cls._header.unpack_from(data)
+        if magic != cls._magic or not 1 <= version <= cls._version:
+            raise ValueError('Неизвестный формат сохранения')
+        offset = cls._header.size
+        name = bytes(data[offset:offset + name_length]).decode('utf-8')
+        offset += name_length + len(_pad(name_length))
+
+        if version == 1:
+            (score, speed, health, win, game_over, bonus_cell, width, height,
+             length, length_change, food_count, free_count) = cls._state_v1.unpack_from(data, offset)
+            timed_food = steps = 0
+            offset += cls._state_v1.size
+        else:
+            (score, speed, health, win, game_over, timed_food, bonus_cell, width, height,
+             length, length_change, food_count, free_count, steps) = cls._state.unpack_from(data, offset)
+            offset += cls._state.size
+
+        if level is None:
+            level = Level(name, health, timed_food=bool(timed_food))
+        elif level.name != name:
+            raise ValueError(f'Сохранение уровня {name}, а не {level.name}')
+        elif (level.food_spawner is not None) != bool(timed_food):
+            raise ValueError('Режим бонусной еды не совпадает с сохранением')
+        field = level.field
+        if (field.width, field.height) != (width, height):
+            raise ValueError('Размеры поля не совпадают с сохранением')
+
+        cells = _unpack_cells(data, offset, length)
+        offset += 4 * length
+        directions = bytes(data[offset:offset + length])
+        offset += length + len(_pad(5 * length))
+
+        foods = []
+        for _ in range(food_count):
+            speed_change, cell, food_length, food_score = cls._food.unpack_from(data, offset)
+            foods.append((cell % width, cell // width, Food(speed_change, food_length, food_score)))
+            offset += cls._food.size
+
+        free_cells = _unpack_cells(data, offset, free_count)
+        offset += 4 * free_count + len(_pad(4 * free_count))
+
+        gauss, has_gauss = cls._random.unpack_from(data, offset)
+        offset += cls._random.size
+        words = cls._random_words.unpack_from(data, offset)
+        offset += cls._random_words.size + len(_pad(cls._random_words.size))
+
+        sequence, heap_count, active_count = 0, 0, 0
+        if version > 1:
+            sequence, heap_count, active_count = cls._spawner.unpack_from(data, offset)
+            offset += cls._spawner.size
+        heap = []
+        for _ in range(heap_count):
+            deadline, number, cell, kind = cls._deadline.unpack_from(data, offset)
+            heap.append((deadline, number, field.cell_location(cell) if cell >= 0 else None, kind))
+            offset += cls._deadline.size
+        active = []
+        for _ in range(active_count):
+            cell, number = cls._active.unpack_from(data, offset)
+            active.append((field.cell_location(cell), number))
+            offset += cls._active.size
+
+        snake = SnakeSnapshot(tuple((cell % width, cell // width) for cell in cells),
+                              directions, length_change, speed)
+        level.restore(LevelSnapshot(FieldSnapshot(snake, tuple(foods)),
+                                    score, health, bool(win), bool(game_over), steps,
+                                    field.cell_location(bonus_cell) if bonus_cell >= 0 else None,
+                                    (sequence, heap, active) if timed_food else None))
+        field.restore_free_cells(free_cells)
+        level.random.setstate((3, words, gauss if has_gauss else None))
+        return level
+
+    @classmethod
+    def save(cls, level: Level, path: str):
+        with open(path, 'wb') as fd:
+            fd.write(cls.to_bytes(level))
+
+    @classmethod
+    def load(cls, path: str, level: Level = None) -> Level:
+        with open(path, 'rb') as fd:
+            return cls.from_bytes(fd.read(), level)
+
+
+class CheckpointFile:
+    """
+    Несколько сохранений в одном файле с таблицей смещений, чтобы
+    загрузить любое из них через mmap, не читая остальные.
+
+    Формат (little-endian): _header, затем count пар (смещение, размер) uint64,
+    затем сохранения SaveGame, каждое с границы 8 байт.
+    """
+
+    _magic = b'SNKC'
+    _version = 1
+    _header = struct.Struct('<4sHxxQ')
+    _entry = struct.Struct('<QQ')
+
+    def __init__(self, path: str):
+        self._fd = open(path, 'rb')
+        self._map = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < self._header.size:
+            self.close()
+            raise ValueError('Неизвестный формат файла сохранений')
+        magic, version, self.count = self._header.unpack_from(self._map)
+        if magic != self._magic or version != self._version:
+            self.close()
+            raise ValueError('Неизвестный формат файла сохранений')
+
+    @classmethod
+    def write(cls, path: str, levels):
+        saves = [SaveGame.to_bytes(level) for level in levels]
+        offset = cls._header.size + cls._entry.size * len(saves)
+        entries = []
+        for save in saves:
+            entries.append(cls._entry.pack(offset, len(save)))
+            offset += len(save)
+        with open(path, 'wb') as fd:
+            fd.write(cls._header.pack(cls._magic, cls._version, len(saves)))
+            fd.write(b''.join(entries))
+            fd.write(b''.join(saves))
+
+    def __len__(self):
+        return self.count
+
+    def load(self, number: int, level: Level = None) -> Level:
+        """Загрузить сохранение с номером `number` (в `level`, если он задан)"""
+        if not 0 <= number < self.count:
+            raise IndexError(number)
+        offset, size = self._entry.unpack_from(self._map, self._header.size + self._entry.size * number)
+        with memoryview(self._map)[offset:offset + size] as data:
+            return SaveGame.from_bytes(data, level)
+
+    def close(self):
+        self._map.close()
+        self._fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
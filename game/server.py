@@ -0,0 +1,344 @@
+"""
+Авторитетный сервер сетевой игры на asyncio.
+
+Симуляция (Arena) идёт только на сервере с постоянной частотой тиков.
+Клиенты присылают повороты, сервер рассылает всем одно и то же
+сообщение с изменениями за тик, а полное состояние - только при подключении.
+
+Протокол - по строке JSON на сообщение поверх TCP, клетки передаются
+индексами сетки занятости (y * width + x), еда - номером вида в settings.food.
+
+Клиент -> сервер:
+    {"turn": Direction.value}  поворот своей змейки
+    {"join": true}             новая змейка взамен погибшей
+    Сообщение, которое не разбирается как такой объект, закрывает соединение.
+
+Сервер -> клиент:
+    {"type": "welcome", "id", "width", "height", "walls", "snakes", "foods", "tick"}
+        id - номер своей змейки (null, если места нет), snakes - {номер: клетки от хвоста к голове},
+        foods - [[клетка, вид]]
+    {"type": "spawn", "id"}  номер новой змейки после {"join": true}
+    {"type": "tick", "tick", "joined", "heads", "dead", "food_added", "food_removed"}
+        joined - {номер: клетки от хвоста к голове} змеек, появившихся до этого тика,
+        heads - {номер: [новая голова, сколько клеток ушло с хвоста]},
+        dead - номера погибших и отключившихся змеек; номер может снова появиться
+        в joined, но не раньше следующего тика
+
+    python -m game.server --port 8765 --level free --tick-rate 14
+"""
+import argparse
+import asyncio
+import json
+from collections import deque
+
+from game.arena import Arena
+from game.direction import Direction, DirectionBuffer
+from game.entities import Food
+from game.service_entities.profiler import Profiler
+from game.service_entities.scheduler import Scheduler
+from game.settings import Settings
+
+__all__ = ['GameServer', 'GameClient']
+
+settings = Settings.get()
+
+_directions = tuple(Direction)
+_food_kind = {}
+
+
+@Settings.on_reload
+def _apply_settings(settings: Settings):
+    """Номера видов еды в протоколе - по порядку в settings.food"""
+    global _food_kind
+    _food_kind = {Food(*food): kind for kind, food in enumerate(settings.food)}
+
+
+_apply_settings(settings)
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+class _Player:
+    __slots__ = ('writer', 'number', 'buffer')
+
+    def __init__(self, writer, number):
+        self.writer = writer
+        self.number = number
+        self.buffer = DirectionBuffer()
+
+
+class GameServer:
+    """
+    Принимает клиентов по TCP и ведёт общую арену.
+    Каждый тик сообщение кодируется один раз и пишется во все соединения;
+    клиент, который не успевает читать (буфер больше max_buffer), отключается.
+    """
+
+    def __init__(self, arena: Arena, tick_rate: float = 14.0, max_buffer: int = 1 << 20):
+        """
+        :param tick_rate: тиков симуляции в секунду
+        :param max_buffer: сколько байт может скопиться в буфере отправки клиента
+        """
+        self.arena = arena
+        self.tick_rate = tick_rate
+        self.max_buffer = max_buffer
+        self.tick_count = 0
+        self.profiler = Profiler()
+        self._players = {}
+        self._handlers = set()
+        self._joined = {}
+        self._left = []
+        self._server = None
+        self._ticker = None
+
+        # Змейки, уже стоящие на арене (змейка карты), никому не принадлежат
+        for number in range(len(arena.snakes)):
+            arena.remove_snake(number)
+
+    @property
+    def players_count(self) -> int:
+        return len(self._players)
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._ticker = asyncio.ensure_future(self._run_ticks())
+
+    async def stop(self):
+        self._ticker.cancel()
+        self._server.close()
+        for writer in list(self._players):
+            self._disconnect(writer)
+        # Обработчики завершатся сами, прочитав конец закрытого соединения
+        await asyncio.gather(*self._handlers)
+        await self._server.wait_closed()
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 0):
+        await self.start(host, port)
+        try:
+            await self._ticker
+        finally:
+            await self.stop()
+
+    async def _run_ticks(self):
+        loop = asyncio.get_running_loop()
+        scheduler = Scheduler(clock=loop.time)
+        scheduler.every('tick', 1 / self.tick_rate)
+        while True:
+            for _ in scheduler.update():
+                with self.profiler.phase('tick'):
+                    self.tick()
+            await asyncio.sleep(scheduler.time_to_next())
+
+    def _body(self, number: int) -> list:
+        index = self.arena.field.index
+        return [index(part.location) for part in reversed(self.arena.snakes[number])]
+
+    def _spawn(self, player: _Player):
+        try:
+            player.number = self.arena.spawn_snake()
+        except ValueError:
+            player.number = None
+            return
+        self.arena.food_count = max(1, len(self._players))
+        self._joined[player.number] = self._body(player.number)
+
+    def _welcome(self, player: _Player) -> dict:
+        field = self.arena.field
+        return {
+            'type': 'welcome',
+            'id': player.number,
+            'width': field.width,
+            'height': field.height,
+            'walls': sorted(field.index(location) for location in field.walls),
+            'snakes': {number: self._body(number)
+                       for number, alive in enumerate(self.arena.alive) if alive},
+            'foods': [[field.index(location), _food_kind[food]]
+                      for location, food in field.foods_location.items()],
+            'tick': self.tick_count,
+        }
+
+    async def _handle(self, reader, writer):
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        player = _Player(writer, None)
+        self._players[writer] = player
+        self._spawn(player)
+        writer.write(_encode(self._welcome(player)))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    break
+                self._receive(player, message)
+        except (ConnectionError, ValueError, LookupError, TypeError):
+            pass
+        finally:
+            self._disconnect(writer)
+            self._handlers.discard(handler)
+
+    def _receive(self, player: _Player, message: dict):
+        arena = self.arena
+        if 'turn' in message:
+            if player.number is not None and arena.alive[player.number]:
+                player.buffer.push(_directions[message['turn']],
+                                   arena.snakes[player.number].head.direction)
+        elif message.get('join'):
+            if player.number is None or not arena.alive[player.number]:
+                player.buffer.clear()
+                self._spawn(player)
+                player.writer.write(_encode({'type': 'spawn', 'id': player.number}))
+
+    def _disconnect(self, writer):
+        player = self._players.pop(writer, None)
+        if player is None:
+            return
+        if player.number is not None and self.arena.alive[player.number]:
+            self.arena.remove_snake(player.number)
+            self._joined.pop(player.number, None)
+            self._left.append(player.number)
+        writer.close()
+
+    def tick(self):
+        """Шаг арены и рассылка изменений"""
+        arena = self.arena
+        field = arena.field
+        directions = [None] * len(arena.snakes)
+        for player in self._players.values():
+            if player.number is not None:
+                directions[player.number] = player.buffer.pop()
+
+        moved = [number for number, alive in enumerate(arena.alive) if alive]
+        lengths = [len(arena.snakes[number]) for number in moved]
+        foods = dict(field.foods_location)
+
+        dead = arena.step(directions)
+        # Номера погибших змеек арена отдаст новым, поэтому игроки их забывают
+        for player in self._players.values():
+            if player.number is not None and not arena.alive[player.number]:
+                player.number = None
+
+        heads = {}
+        for number, length in zip(moved, lengths):
+            if arena.alive[number]:
+                snake = arena.snakes[number]
+                heads[number] = [field.index(snake.head.location), length + 1 - len(snake)]
+        message = {
+            'type': 'tick',
+            'tick': self.tick_count,
+            'joined': self._joined,
+            'heads': heads,
+            'dead': self._left + dead,
+            'food_added': [[field.index(location), _food_kind[food]]
+                           for location, food in field.foods_location.items()
+                           if location not in foods],
+            'food_removed': [field.index(location) for location in foods
+                             if location not in field.foods_location],
+        }
+        self._joined = {}
+        self._left = []
+        self.tick_count += 1
+        self._broadcast(_encode(message))
+
+    def _broadcast(self, data: bytes):
+        for writer in list(self._players):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self._disconnect(writer)
+            else:
+                writer.write(data)
+
+
+class GameClient:
+    """
+    Клиент, который по сообщениям сервера восстанавливает состояние игры:
+    змейки (номер -> клетки от хвоста к голове) и еду (клетка -> вид)
+    """
+
+    def __init__(self):
+        self.id = None
+        self.width = self.height = 0
+        self.walls = set()
+        self.snakes = {}
+        self.foods = {}
+        self.tick = -1
+        self._reader = None
+        self._writer = None
+
+    async def connect(self, host: str, port: int):
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        await self.receive()
+
+    def turn(self, direction: Direction):
+        self._writer.write(_encode({'turn': direction.value}))
+
+    def join(self):
+        self._writer.write(_encode({'join': True}))
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def receive(self) -> dict:
+        """Прочитать одно сообщение сервера и применить его"""
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError('Сервер закрыл соединение')
+        message = json.loads(line)
+        self.apply(message)
+        return message
+
+    def apply(self, message: dict):
+        kind = message['type']
+        if kind == 'welcome':
+            self.id = message['id']
+            self.width, self.height = message['width'], message['height']
+            self.walls = set(message['walls'])
+            self.snakes = {int(number): deque(body) for number, body in message['snakes'].items()}
+            self.foods = {index: food for index, food in message['foods']}
+            self.tick = message['tick'] - 1
+        elif kind == 'spawn':
+            self.id = message['id']
+        elif kind == 'tick':
+            for number, body in message['joined'].items():
+                self.snakes[int(number)] = deque(body)
+            for number in message['dead']:
+                self.snakes.pop(number, None)
+            for number, (head, trim) in message['heads'].items():
+                body = self.snakes[int(number)]
+                body.append(head)
+                for _ in range(trim):
+                    body.popleft()
+            for index in message['food_removed']:
+                self.foods.pop(index, None)
+            for index, food in message['food_added']:
+                self.foods[index] = food
+            self.tick = message['tick']
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Сервер сетевой игры')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--level', default='free', help='карта арены')
+    parser.add_argument('--tick-rate', type=float, default=14.0, help='тиков в секунду')
+    parser.add_argument('--seed', type=int)
+    options = parser.parse_args(args)
+
+    server = GameServer(Arena.from_level(options.level, 0, options.seed), options.tick_rate)
+    try:
+        asyncio.run(server.serve_forever(options.host, options.port))
+    except KeyboardInterrupt:
+        pass
+    print(f'ticks={server.tick_count} tick time (s): {server.profiler.percentiles("tick")}')
+
+
+if __name__ == '__main__':
+    main()
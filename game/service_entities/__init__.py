@@ -1 +1 @@
-__all__ = ['vector', 'queue']
\ No newline at end of file
+__all__ = ['vector', 'queue', 'scheduler', 'profiler', 'viewport']
\ No newline at end of file
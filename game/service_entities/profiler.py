@@ -0,0 +1,102 @@
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+_null_phase = nullcontext()
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.name, self.profiler.clock() - self.start)
+
+
+class Profiler:
+    """
+    Таймеры фаз кадра со скользящим окном последних замеров.
+    Выключенный профайлер ничего не замеряет: phase возвращает пустой контекст.
+    """
+
+    def __init__(self, enabled=True, window=1000, clock=time.perf_counter):
+        """
+        :param window: сколько последних замеров каждой фазы хранится
+        """
+        self.enabled = enabled
+        self.window = window
+        self.clock = clock
+        self._samples = {}
+        self._phases = {}
+        self._last_frame = None
+
+    def phase(self, name: str):
+        """Контекст, замеряющий время фазы `name`"""
+        if not self.enabled:
+            return _null_phase
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def add(self, name: str, seconds: float):
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def frame(self):
+        """Отметить конец кадра; время между кадрами копится в фазе 'frame'"""
+        if not self.enabled:
+            return
+        now = self.clock()
+        if self._last_frame is not None:
+            self.add('frame', now - self._last_frame)
+        self._last_frame = now
+
+    @property
+    def phases(self) -> list:
+        return list(self._samples)
+
+    def percentiles(self, name: str, percents=(50, 95, 99)) -> dict:
+        """Перцентили времени фазы в секундах по скользящему окну"""
+        samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return {}
+        return {p: samples[min(len(samples) - 1, len(samples) * p // 100)] for p in percents}
+
+    def histogram(self, name: str) -> dict:
+        """
+        Гистограмма окна по степеням двойки микросекунд:
+        верхняя граница корзины в мкс -> количество замеров
+        """
+        result = {}
+        for seconds in self._samples.get(name, ()):
+            bucket = 1 << int(seconds * 1e6).bit_length()
+            result[bucket] = result.get(bucket, 0) + 1
+        return dict(sorted(result.items()))
+
+    def stats(self) -> dict:
+        result = {}
+        for name, samples in self._samples.items():
+            percentiles = self.percentiles(name)
+            result[name] = {
+                'count': len(samples),
+                'mean': sum(samples) / len(samples),
+                'max': max(samples),
+                **{f'p{p}': value for p, value in percentiles.items()},
+                'histogram_us': self.histogram(name),
+            }
+        return result
+
+    def dump(self, path: str):
+        with open(path, 'w') as fd:
+            json.dump(self.stats(), fd, indent=2)
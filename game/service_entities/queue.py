@@ -1,14 +1,16 @@
+from collections import deque
+
+
 class Queue:
     def __init__(self):
-        self._queue = []
+        self._queue = deque()
 
     def enqueue(self, value):
         self._queue.append(value)
 
     def dequeue(self):
         if len(self._queue):
-            result = self._queue.pop(0)
-            return result
+            return self._queue.popleft()
         raise ValueError("Queue is empty")
 
     @property
@@ -20,7 +22,12 @@ class Queue:
         return self._queue[-1] if len(self._queue) else None
 
     def __iter__(self):
+        """Итератор от head к tail без копирования"""
         return iter(self._queue)
 
+    def __reversed__(self):
+        """Итератор от tail к head без копирования"""
+        return reversed(self._queue)
+
     def __len__(self):
         return len(self._queue)
@@ -0,0 +1,62 @@
+import time
+
+
+class Scheduler:
+    """
+    Планировщик с фиксированным шагом времени.
+    Каждое событие копит время до своего срока, срок следующего вызова
+    считается от срока предыдущего, поэтому частота не квантуется кадрами.
+    """
+
+    def __init__(self, clock=time.perf_counter, sleep=time.sleep, max_catch_up=5):
+        """
+        :param max_catch_up: сколько раз событие может сработать за один update;
+        остальное отставание сбрасывается
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.max_catch_up = max_catch_up
+        self._events = {}
+
+    def every(self, name, period, delay=None):
+        """
+        :param period: период в секундах или функция, возвращающая его
+        (перечитывается после каждого срабатывания)
+        :param delay: время до первого срабатывания, по умолчанию - период
+        """
+        period_getter = period if callable(period) else (lambda: period)
+        if delay is None:
+            delay = period_getter()
+        self._events[name] = [self.clock() + delay, period_getter]
+
+    def cancel(self, name):
+        self._events.pop(name, None)
+
+    def update(self) -> list:
+        """
+        :return: имена наступивших событий в порядке их сроков
+        """
+        now = self.clock()
+        due = []
+        for name, event in self._events.items():
+            count = 0
+            while event[0] <= now:
+                if count == self.max_catch_up:
+                    event[0] = now + event[1]()
+                    break
+                due.append((event[0], name))
+                event[0] += event[1]()
+                count += 1
+        due.sort(key=lambda item: item[0])
+        return [name for _, name in due]
+
+    def time_to_next(self) -> float:
+        if not self._events:
+            return 0.0
+        return max(0.0, min(event[0] for event in self._events.values()) - self.clock())
+
+    def wait(self):
+        """Спать до ближайшего события"""
+        delay = self.time_to_next()
+        if delay:
+            self.sleep(delay)
@@ -1,12 +1,14 @@
-class Vector:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+from typing import NamedTuple
 
-    def __eq__(self, other):
-        if not isinstance(other, Vector):
-            return False
-        return self.x == other.x and self.y == other.y
+
+class Vector(NamedTuple):
+    """
+    Неизменяемая точка с целыми координатами. Основа - tuple: создание,
+    сравнение и хэш (зависящий от обеих координат) делаются в C
+    """
+
+    x: int
+    y: int
 
     def __add__(self, other):
         return Vector(other.x + self.x, other.y + self.y)
@@ -14,8 +16,7 @@ class Vector:
     def __mul__(self, other: int):
         return Vector(self.x * other, self.y * other)
 
-    def __hash__(self):
-        return hash(self.x) * 357 + hash(self.y)
+    __rmul__ = __mul__
 
     def __str__(self):
         return '({}, {})'.format(self.x, self.y)
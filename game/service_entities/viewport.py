@@ -0,0 +1,58 @@
+from game.service_entities.vector import Vector
+
+
+class Viewport:
+    """
+    Видимая часть поля в клетках. Следует за точкой (головой змейки):
+    сдвигается, когда точка подходит к краю ближе, чем на margin клеток,
+    и не выходит за границы поля
+    """
+
+    def __init__(self, size_view: tuple, size_field: tuple, margin: int = None):
+        """
+        :param size_view: наибольший размер видимой части, клетки
+        :param margin: отступ от края, при входе в который видимая часть сдвигается
+        """
+        self.field_width, self.field_height = size_field
+        self.width = min(size_view[0], self.field_width)
+        self.height = min(size_view[1], self.field_height)
+        self.margin = min(self.width, self.height) // 4 if margin is None else margin
+        self.x = 0
+        self.y = 0
+
+    @staticmethod
+    def _clamp(start: int, size: int, field_size: int) -> int:
+        return max(0, min(start, field_size - size))
+
+    def _follow_axis(self, start: int, size: int, field_size: int, point: int) -> int:
+        if point < start + self.margin:
+            start = point - self.margin
+        elif point >= start + size - self.margin:
+            start = point - size + self.margin + 1
+        return self._clamp(start, size, field_size)
+
+    def center(self, location: Vector):
+        """Поставить `location` в центр видимой части (насколько позволяют края поля)"""
+        self.x = self._clamp(location.x - self.width // 2, self.width, self.field_width)
+        self.y = self._clamp(location.y - self.height // 2, self.height, self.field_height)
+
+    def follow(self, location: Vector) -> (int, int):
+        """
+        Сдвинуть видимую часть так, чтобы `location` был не ближе margin к её краю
+        :return: (dx, dy), на сколько клеток она сдвинулась
+        """
+        x = self._follow_axis(self.x, self.width, self.field_width, location.x)
+        y = self._follow_axis(self.y, self.height, self.field_height, location.y)
+        dx, dy = x - self.x, y - self.y
+        self.x, self.y = x, y
+        return dx, dy
+
+    def index_ranges(self):
+        """Отрезки [start, stop) индексов сетки занятости поля по видимым строкам"""
+        for y in range(self.y, self.y + self.height):
+            start = y * self.field_width + self.x
+            yield start, start + self.width
+
+    def __contains__(self, location: Vector) -> bool:
+        return (self.x <= location.x < self.x + self.width
+                and self.y <= location.y < self.y + self.height)
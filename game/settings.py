@@ -1,83 +1,131 @@
 """Модуль настроек игры"""
 import configparser
-from copy import deepcopy
 from os.path import join
+from types import MappingProxyType
 
 
 class Settings:
+    """
+    Настройки, прочитанные из ini-файла один раз при создании.
+    Объект неизменяем; общий для процесса экземпляр возвращает Settings.get(),
+    перечитать файл можно через Settings.reload(). Таблицы, которые модули
+    строят из настроек при импорте, перестраиваются функциями из Settings.on_reload
+    """
+
+    _shared = None
+    _reload_callbacks = []
+
+    food: tuple
+    not_basic_food: tuple
+    bonus_food: tuple
+    bonus_food_period: int
+    bonus_food_max: int
+    food_name_picture: MappingProxyType
+    levels: tuple
+    picture_size: int
+    view_size: tuple
+    levels_dir: str
+    levels_cache_dir: str
+    wall_symbol: str
+    empty_symbol: str
+
     def __init__(self, filename='settings.ini'):
         """Чтение настроек"""
-        self._config = configparser.ConfigParser(default_section='')
-        self._config.optionxform = str
-        self._config.read(filename, encoding='utf8')
-
-    def _global(self):
-        return self._config['GLOBAL']
-
-    def _level(self):
-        return self._config['LEVEL']
+        self._load(filename)
+
+    @classmethod
+    def get(cls, filename='settings.ini'):
+        """Общий для процесса экземпляр настроек"""
+        if cls._shared is None:
+            cls._shared = cls(filename)
+        return cls._shared
+
+    @classmethod
+    def reload(cls, filename=None):
+        """Перечитать настройки в общий экземпляр"""
+        if cls._shared is None:
+            return cls.get(filename or 'settings.ini')
+        cls._shared._load(filename or cls._shared.filename)
+        for callback in cls._reload_callbacks:
+            callback(cls._shared)
+        return cls._shared
+
+    @classmethod
+    def on_reload(cls, callback):
+        """Вызывать callback(settings) после каждого Settings.reload(); можно как декоратор"""
+        cls._reload_callbacks.append(callback)
+        return callback
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Настройки неизменяемы, используйте Settings.reload()')
 
     @staticmethod
-    def _parse_food_characteristics(string: str):
-        speed_change, len_change, score = string.split(',')
+    def _parse_food_characteristics(string: str) -> tuple:
+        speed_change, len_change, score = string.split(',')[:3]
         return float(speed_change), int(len_change), int(score)
 
-    def _food(self) -> dict:
-        return {name: self._parse_food_characteristics(food) for name, food in self._config['FOOD'].items()}
-
-    @property
-    def food(self) -> list:
-        return list(self._food().values())
-
-    @property
-    def not_basic_food(self) -> list:
-        result = deepcopy(self.food)
-        result.remove(self._food()['basic_apple'])
-        return result
-
-    @property
-    def food_name_picture(self) -> dict:
-        return {food: picture for picture, food in self._food().items()}
-
-    @property
-    def levels(self):
-        return list(self._config['LEVELS'].values())
-
-    @property
-    def picture_size(self):
-        """Размер картинок"""
-        return int(self._global()['size_picture'])
-
-    def picture(self, name: str):
+    @staticmethod
+    def _parse_food_spawn(string: str) -> tuple:
+        """Вес и время жизни бонусной еды (по умолчанию 1 и 0 - пока не съедят)"""
+        values = string.split(',')[3:]
+        weight = float(values[0]) if len(values) > 0 else 1.0
+        lifetime = int(values[1]) if len(values) > 1 else 0
+        return weight, lifetime
+
+    def _load(self, filename: str):
+        config = configparser.ConfigParser(default_section='')
+        config.optionxform = str
+        config.read(filename, encoding='utf8')
+        global_section = config['GLOBAL']
+        level_section = config['LEVEL']
+
+        food_by_name = {name: self._parse_food_characteristics(food)
+                        for name, food in config['FOOD'].items()}
+        not_basic_food = list(food_by_name.values())
+        not_basic_food.remove(food_by_name['basic_apple'])
+        bonus_food = tuple((food_by_name[name], *self._parse_food_spawn(food))
+                           for name, food in config['FOOD'].items()
+                           if name != 'basic_apple')
+
+        values = {
+            'filename': filename,
+            'food': tuple(food_by_name.values()),
+            'not_basic_food': tuple(not_basic_food),
+            'bonus_food': bonus_food,
+            'bonus_food_period': int(level_section['bonus_food_period']),
+            'bonus_food_max': int(level_section['bonus_food_max']),
+            'food_name_picture': MappingProxyType({food: picture
+                                                   for picture, food in food_by_name.items()}),
+            'levels': tuple(config['LEVELS'].values()),
+            'picture_size': int(global_section['size_picture']),
+            'view_size': tuple(int(size) for size in global_section['view_size'].split(',')),
+            '_pictures': MappingProxyType({name: join(global_section['images_dir'], file)
+                                           for name, file in config['PICTURES'].items()
+                                           if file}),
+            'levels_dir': level_section['levels_dir'],
+            'levels_cache_dir': level_section['cache_dir'],
+            '_map': level_section['map'],
+            '_background': level_section['background'],
+            'wall_symbol': level_section['wall_symbol'],
+            'empty_symbol': level_section['empty_symbol'],
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def picture(self, name: str) -> str:
         """Имя файла с изображением `name`"""
-        name_image_file = self._config['PICTURES'].get(name, None)
-        if not name_image_file:
+        path = self._pictures.get(name)
+        if path is None:
             raise FileNotFoundError()
-        else:
-            return join(self._global()['images_dir'], name_image_file)
+        return path
 
     # region level
-    @property
-    def levels_dir(self):
-        """Директория с уровнями"""
-        return self._level()['levels_dir']
-
-    def map_file(self, level):
+    def map_file(self, level: str) -> str:
         """Файл с описанием карты уровня"""
-        return join(self.levels_dir, level, self._level()['map'])
+        return join(self.levels_dir, level, self._map)
 
-    def background_image(self, level):
+    def background_image(self, level: str) -> str:
         """Файл с задним фоном уровня"""
-        return join(self.levels_dir, level, self._level()['background'])
-
-    @property
-    def wall_symbol(self):
-        """Символ, обозначающий стену на карте"""
-        return self._level()['wall_symbol']
-
-    @property
-    def empty_symbol(self):
-        """Символ, обозначающий пустое место"""
-        return self._level()['empty_symbol']
+        return join(self.levels_dir, level, self._background)
 
     # endregion
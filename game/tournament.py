@@ -0,0 +1,220 @@
+"""
+Турнир: тысячи игр без отрисовки на всех ядрах процессора.
+
+    python -m game.tournament --policies autopilot random --games 1000
+    python -m game.tournament --policies replay --records records --output results.json
+
+Каждый рабочий процесс один раз загружает настройки и карты всех уровней,
+а дальше начинает их заново через Level.restart. Итог - по политике и уровню:
+число игр, средний и лучший счёт, средняя длина игры в шагах, доля побед
+и скорость симуляции в шагах в секунду.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.autopilot import Autopilot
+from game.direction import Direction
+from game.entities import Level
+from game.replay import GameRecord
+from game.settings import Settings
+
+__all__ = ['Policy', 'AutopilotPolicy', 'RandomPolicy', 'ReplayPolicy', 'POLICIES',
+           'play_game', 'run_tournament']
+
+settings = Settings.get()
+
+_directions = tuple(Direction)
+
+
+class Policy:
+    """Стратегия управления змейкой; подклассы переопределяют start и direction"""
+
+    def start(self, level: Level, seed):
+        pass
+
+    def direction(self, level: Level):
+        return None
+
+    def play(self, level: Level, seed, max_steps: int, record: GameRecord = None) -> (Level, int):
+        """
+        Сыграть уже начатый уровень
+        :return: (уровень в конце игры, число шагов змейки)
+        """
+        self.start(level, seed)
+        steps = 0
+        while not level.finished and steps < max_steps:
+            level.play_step(self.direction(level))
+            steps += 1
+        return level, steps
+
+
+class AutopilotPolicy(Policy):
+    def start(self, level, seed):
+        self.autopilot = Autopilot()
+
+    def direction(self, level):
+        return self.autopilot.direction(level.field)
+
+
+class RandomPolicy(Policy):
+    # Вероятность повернуть на шаге
+    turn_probability = 0.2
+
+    def start(self, level, seed):
+        self.random = random.Random(seed)
+
+    def direction(self, level):
+        if self.random.random() < self.turn_probability:
+            return self.random.choice(_directions)
+        return None
+
+
+class ReplayPolicy(Policy):
+    """
+    Повторяет записанную игру (GameRecord) вместе с появлением бонусной еды.
+    Запись первой версии играется на новом уровне без FoodSpawner, а не на `level`
+    """
+
+    def play(self, level, seed, max_steps, record=None):
+        steps = 0
+
+        def count(_, event):
+            nonlocal steps
+            if event != GameRecord.BONUS_FOOD:
+                steps += 1
+
+        return record.replay(count, level), steps
+
+
+POLICIES = {
+    'autopilot': AutopilotPolicy,
+    'random': RandomPolicy,
+    'replay': ReplayPolicy,
+}
+
+# Состояние рабочего процесса: загруженные уровни, политики и предел длины игры
+# (в свободной игре победы нет, и она может не закончиться)
+_levels = {}
+_policies = {}
+_max_steps = 5000
+
+
+def _init_worker(level_names, max_steps):
+    global _max_steps
+    _max_steps = max_steps
+    Settings.get()
+    for name in level_names:
+        _levels[name] = Level(name, 1)
+
+
+def play_game(job: tuple) -> tuple:
+    """
+    :param job: (policy, level_name, health, seed, record_path)
+    :return: (policy, level_name, score, steps, win, seconds)
+    """
+    policy_name, level_name, health, seed, record_path = job
+    record = GameRecord.load(record_path) if record_path is not None else None
+    level = _levels.get(level_name)
+    if level is None:
+        level = _levels[level_name] = Level(level_name, health, seed)
+    else:
+        level.restart(health, seed)
+    policy = _policies.get(policy_name)
+    if policy is None:
+        policy = _policies[policy_name] = POLICIES[policy_name]()
+
+    start = time.perf_counter()
+    level, steps = policy.play(level, seed, _max_steps, record)
+    seconds = time.perf_counter() - start
+    win = level.win_flag and level.max_score > 0
+    return policy_name, level_name, level.score, steps, win, seconds
+
+
+def make_jobs(policies, levels, games: int, seed: int = 0, records=()) -> list:
+    """
+    :param games: игр на каждый уровень для каждой политики, кроме replay
+    :param records: файлы записей для политики replay
+    """
+    jobs = []
+    for policy in policies:
+        if policy == 'replay':
+            for path in records:
+                record = GameRecord.load(path)
+                jobs.append((policy, record.level_name, record.health, record.seed, path))
+            continue
+        for level in levels:
+            health = 1 if level == 'free' else 3
+            for game in range(games):
+                jobs.append((policy, level, health, seed + game, None))
+    return jobs
+
+
+def aggregate(results) -> dict:
+    """(policy, level) -> games, score_mean, score_max, steps_mean, win_rate, steps_per_s"""
+    groups = {}
+    for policy, level, score, steps, win, seconds in results:
+        group = groups.setdefault((policy, level), [0, 0, None, 0, 0, 0.0])
+        group[0] += 1
+        group[1] += score
+        group[2] = score if group[2] is None else max(group[2], score)
+        group[3] += steps
+        group[4] += win
+        group[5] += seconds
+    return {key: {
+        'games': games,
+        'score_mean': total_score / games,
+        'score_max': score_max,
+        'steps_mean': total_steps / games,
+        'win_rate': wins / games,
+        'steps_per_s': total_steps / seconds if seconds else 0.0,
+    } for key, (games, total_score, score_max, total_steps, wins, seconds) in sorted(groups.items())}
+
+
+def run_tournament(jobs: list, workers: int = None, max_steps: int = _max_steps) -> dict:
+    workers = workers or os.cpu_count() or 1
+    level_names = sorted({job[1] for job in jobs})
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(level_names, max_steps)) as executor:
+        return aggregate(executor.map(play_game, jobs, chunksize=chunksize))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Турнир политик без отрисовки')
+    parser.add_argument('--policies', nargs='+', default=['autopilot', 'random'],
+                        choices=sorted(POLICIES))
+    parser.add_argument('--levels', nargs='+', default=[*settings.levels, 'free'])
+    parser.add_argument('--games', type=int, default=100, help='игр на уровень для каждой политики')
+    parser.add_argument('--seed', type=int, default=0, help='зерно первой игры, дальше по порядку')
+    parser.add_argument('--max-steps', type=int, default=_max_steps, help='предел длины игры')
+    parser.add_argument('--records', metavar='DIR', help='папка с записями для политики replay')
+    parser.add_argument('--workers', type=int, help='число процессов (по умолчанию - число ядер)')
+    parser.add_argument('--output', help='файл для итогов в JSON')
+    options = parser.parse_args(args)
+
+    records = sorted(glob.glob(os.path.join(options.records, '*.snr'))) if options.records else []
+    jobs = make_jobs(options.policies, options.levels, options.games, options.seed, records)
+    start = time.perf_counter()
+    summary = run_tournament(jobs, options.workers, options.max_steps)
+    elapsed = time.perf_counter() - start
+
+    for (policy, level), stats in summary.items():
+        print(f'{policy:10} {level:10} games={stats["games"]:<6} '
+              f'score={stats["score_mean"]:.2f} (max {stats["score_max"]}) '
+              f'steps={stats["steps_mean"]:.1f} win={stats["win_rate"]:.1%} '
+              f'{stats["steps_per_s"]:.0f} steps/s')
+    print(f'{len(jobs)} games in {elapsed:.1f}s', file=sys.stderr)
+    if options.output:
+        with open(options.output, 'w') as fd:
+            json.dump([{'policy': policy, 'level': level, **stats}
+                       for (policy, level), stats in summary.items()], fd, indent=2)
+
+
+if __name__ == '__main__':
+    main()
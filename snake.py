@@ -1,4 +1,21 @@
+import argparse
+
 from game.game import Game
 
-game = Game()
+parser = argparse.ArgumentParser(description='Snake Game')
+parser.add_argument('--record', metavar='DIR',
+                    help='сохранять записи сыгранных уровней в папку DIR '
+                         '(воспроизведение: python -m game.replay DIR/*.snr)')
+parser.add_argument('--autopilot', action='store_true',
+                    help='змейкой управляет автопилот')
+parser.add_argument('--profile', action='store_true',
+                    help='показывать время фаз кадра (перцентили в мс) поверх игры')
+parser.add_argument('--profile-dump', metavar='FILE',
+                    help='после каждого уровня записывать статистику фаз кадра в FILE (JSON)')
+options = parser.parse_args()
+
+game = Game(autopilot=options.autopilot,
+            record_dir=options.record,
+            profile_overlay=options.profile,
+            profile_path=options.profile_dump)
 game.main_loop()
@@ -0,0 +1,104 @@
+import unittest
+
+from game.arena import Arena
+from game.direction import Direction
+from game.entities import *
+from game.service_entities.vector import Vector
+
+
+def straight_snake(head: Vector, direction: Direction, length: int = 2) -> Snake:
+    offset = {Direction.RIGHT: (-1, 0), Direction.LEFT: (1, 0),
+              Direction.DOWN: (0, -1), Direction.UP: (0, 1)}[direction]
+    return Snake([SnakePart(Vector(head.x + offset[0] * i, head.y + offset[1] * i), direction)
+                  for i in range(length)])
+
+
+class TestArena(unittest.TestCase):
+    def make_arena(self, *snakes) -> Arena:
+        field = Field(snakes[0], set(), (10, 10))
+        return Arena(field, snakes[1:], food_count=0)
+
+    def test_step_headToHead(self):
+        arena = self.make_arena(straight_snake(Vector(3, 0), Direction.RIGHT),
+                                straight_snake(Vector(5, 0), Direction.LEFT),
+                                straight_snake(Vector(0, 5), Direction.RIGHT))
+
+        self.assertEqual([0, 1], arena.step())
+        self.assertEqual([False, False, True], arena.alive)
+        self.assertEqual(1, arena.alive_count)
+
+    def test_step_headsPassThrough(self):
+        arena = self.make_arena(straight_snake(Vector(3, 0), Direction.RIGHT),
+                                straight_snake(Vector(4, 0), Direction.LEFT))
+
+        self.assertEqual([0, 1], arena.step())
+
+    def test_step_headToBody(self):
+        arena = self.make_arena(straight_snake(Vector(3, 3), Direction.RIGHT, 4),
+                                straight_snake(Vector(2, 2), Direction.DOWN))
+
+        self.assertEqual([1], arena.step())
+        self.assertEqual([True, False], arena.alive)
+
+    def test_step_intoLeavingTail(self):
+        arena = self.make_arena(straight_snake(Vector(3, 3), Direction.RIGHT, 3),
+                                straight_snake(Vector(1, 2), Direction.DOWN))
+
+        self.assertEqual([], arena.step())
+
+    def test_step_removesDeadSnake(self):
+        arena = self.make_arena(straight_snake(Vector(3, 3), Direction.RIGHT, 4),
+                                straight_snake(Vector(2, 2), Direction.DOWN, 3))
+        free_cells = arena.field.free_cells_count
+
+        arena.step()
+
+        # змейка 1 убрана с поля, змейка 0 сдвинулась без роста
+        self.assertEqual(free_cells + 3, arena.field.free_cells_count)
+        self.assertEqual([], arena.step())
+
+    def test_step_scores(self):
+        arena = self.make_arena(straight_snake(Vector(3, 0), Direction.RIGHT),
+                                straight_snake(Vector(3, 5), Direction.RIGHT))
+        arena.field.add_food(Vector(4, 5), Food(1, 1, 2))
+        arena.field.add_food(Vector(5, 5), Food())
+
+        arena.step([None, None])
+        arena.step([Direction.DOWN, None])
+
+        self.assertEqual([0, 3], arena.scores)
+        self.assertEqual((3, 1), (len(arena.snakes[1]), arena.snakes[1].length_change))
+
+    def test_add_snake_reusesNumberAfterStep(self):
+        arena = self.make_arena(straight_snake(Vector(3, 0), Direction.RIGHT),
+                                straight_snake(Vector(3, 5), Direction.RIGHT))
+        arena.remove_snake(1)
+
+        self.assertEqual(2, arena.add_snake(straight_snake(Vector(3, 7), Direction.RIGHT)))
+        arena.step()
+        number = arena.add_snake(straight_snake(Vector(3, 3), Direction.RIGHT))
+
+        self.assertEqual(1, number)
+        self.assertEqual(3, len(arena.snakes))
+        self.assertEqual((True, 0), (arena.alive[1], arena.scores[1]))
+
+    def test_from_level(self):
+        arena = Arena.from_level('free', 20, seed=3)
+
+        self.assertEqual(21, len(arena.snakes))
+        self.assertEqual(21, len(arena.field.foods_location))
+        occupied = sum(len(snake) for snake in arena.snakes)
+        self.assertEqual(occupied, sum(cell // Field.BODY for cell in arena.field.cells))
+
+    def test_play_manyBots(self):
+        arena = Arena.from_level('free', 50, seed=1)
+
+        for _ in range(200):
+            arena.step()
+            body = [0] * len(arena.field.cells)
+            for snake, alive in zip(arena.snakes, arena.alive):
+                if alive:
+                    for part in snake:
+                        body[arena.field.index(part.location)] += 1
+            self.assertEqual(body, [cell // Field.BODY for cell in arena.field.cells])
+        self.assertLess(arena.alive_count, 51)
@@ -0,0 +1,69 @@
+import unittest
+
+from game.autopilot import Autopilot
+from game.direction import Direction
+from game.entities import *
+from game.service_entities.vector import Vector
+
+
+class TestAutopilot(unittest.TestCase):
+    def setUp(self):
+        snake = Snake([SnakePart(Vector(2, 1), Direction.RIGHT),
+                       SnakePart(Vector(1, 1), Direction.RIGHT),
+                       SnakePart(Vector(0, 1), Direction.RIGHT)])
+        walls = {Vector(x, 2) for x in range(1, 6)}
+        self.field = Field(snake, walls, (6, 4))
+        self.autopilot = Autopilot()
+
+    def run_to_food(self, max_steps=20) -> int:
+        for step in range(1, max_steps + 1):
+            self.field.step_snake(self.autopilot.direction(self.field))
+            self.assertFalse(self.field.is_crash())
+            if self.field.snake.head.location in self.field.foods_location:
+                return step
+        self.fail('Змейка не дошла до еды')
+
+    def test_direction_toFood(self):
+        self.field.add_food(Vector(4, 1), Food())
+
+        self.assertEqual(2, self.run_to_food())
+
+    def test_direction_throughWrapAround(self):
+        self.field.add_food(Vector(2, 3), Food())
+
+        # вверх через край поля: (2, 1) -> (2, 0) -> (2, 3)
+        self.assertEqual(2, self.run_to_food())
+
+    def test_direction_aroundWall(self):
+        self.field.add_food(Vector(3, 3), Food())
+
+        self.assertEqual(3, self.run_to_food())
+
+    def test_direction_reusesPath(self):
+        self.field.add_food(Vector(5, 0), Food())
+
+        self.run_to_food()
+        self.assertEqual(1, self.autopilot.searches)
+
+    def test_direction_ignoresBadFood(self):
+        self.field.add_food(Vector(3, 1), Food(0.8, -1, -1))
+        self.field.add_food(Vector(0, 3), Food())
+
+        self.run_to_food()
+        self.assertEqual(Vector(0, 3), self.field.snake.head.location)
+
+    def test_direction_whenNoFood(self):
+        direction = self.autopilot.direction(self.field)
+
+        self.assertIn(direction, (Direction.RIGHT, Direction.UP))
+
+    def test_play_level(self):
+        level = Level('level_1', 3, seed=5)
+
+        for _ in range(5000):
+            if level.finished:
+                break
+            level.play_step(self.autopilot.direction(level.field))
+
+        self.assertTrue(level.win_flag)
+        self.assertEqual(3, level.health)
@@ -0,0 +1,105 @@
+import random
+import unittest
+
+import numpy as np
+
+from game.batch import BatchLevel, NO_FOOD
+from game.direction import Direction
+from game.entities import Food, Level
+
+
+class TestBatchLevel(unittest.TestCase):
+    def setUp(self):
+        self.batch = BatchLevel('level_0', 4, health=3, seed=1)
+
+    @staticmethod
+    def clear_food(level: Level):
+        for location in list(level.field.foods_location):
+            level.field.remove_food(location)
+
+    def test_init(self):
+        level = Level('level_0', 3)
+
+        self.assertEqual((level.field.width, level.field.height),
+                         (self.batch.width, self.batch.height))
+        self.assertEqual(level.max_score, self.batch.max_score)
+        self.assertTrue((self.batch.length == len(level.field.snake)).all())
+        self.assertTrue((self.batch.head == level.field.index(level.field.snake.head.location)).all())
+        self.assertTrue(((self.batch.food != NO_FOOD).sum(axis=1) == 1).all())
+
+    def test_step_likeLevel(self):
+        rnd = random.Random(0)
+        levels = [Level('level_0', 3) for _ in range(self.batch.count)]
+        for level in levels:
+            self.clear_food(level)
+        self.batch.food[:] = NO_FOOD
+
+        for _ in range(300):
+            directions = [rnd.choice([-1, 0, 1, 2, 3]) for _ in levels]
+            self.batch.step(directions)
+            for i, level in enumerate(levels):
+                if level.game_over_flag:
+                    continue
+                direction = None if directions[i] == -1 else Direction(directions[i])
+                level.step_snake(direction)
+
+            self.assertEqual([lvl.game_over_flag for lvl in levels], list(self.batch.game_over))
+            self.assertEqual([lvl.health for lvl in levels], list(self.batch.health))
+            for i, level in enumerate(levels):
+                if level.game_over_flag:
+                    continue
+                self.assertEqual(len(level.field.snake), self.batch.length[i])
+                self.assertEqual(level.field.index(level.field.snake.head.location),
+                                 self.batch.head[i])
+
+    def test_step_whenEatFood(self):
+        self.batch.food[:] = NO_FOOD
+        gold = self.batch.foods.index(Food(1, 1, 2))
+        self.batch.food[0, self.batch.head[0] + 1] = gold
+
+        self.batch.step()
+
+        self.assertEqual([2, 0, 0, 0], list(self.batch.score))
+        self.assertEqual([1, 0, 0, 0], list(self.batch.length_change))
+        self.assertEqual(NO_FOOD, self.batch.food[0, self.batch.head[0]])
+
+    def test_step_whenEatBasicFood_spawnsFood(self):
+        self.batch.food[:] = NO_FOOD
+        self.batch.food[:, self.batch.head + 1] = self.batch.basic_food
+
+        self.batch.step()
+
+        self.assertTrue((self.batch.score == 1).all())
+        self.assertTrue(((self.batch.food != NO_FOOD).sum(axis=1) == 1).all())
+
+    def test_step_whenCrash(self):
+        self.batch.cells[0, self.batch.head[0] + 1] = 1
+
+        self.batch.step()
+
+        self.assertEqual([2, 3, 3, 3], list(self.batch.health))
+        self.assertEqual(self.batch.head[1], self.batch.head[0] + 1)
+
+    def test_game_over(self):
+        batch = BatchLevel('level_0', 2, health=1, seed=1)
+        batch.cells[0, batch.head[0] + 1] = 1
+
+        batch.step()
+        batch.step()
+
+        self.assertEqual([True, False], list(batch.game_over))
+        self.assertEqual([True, False], list(batch.done))
+
+    def test_step_whenWall(self):
+        self.batch.walls[self.batch.head[0] + 1] = True
+
+        self.batch.step()
+
+        self.assertTrue((self.batch.health == 2).all())
+
+    def test_spawn_food_whenNoFreeCells(self):
+        self.batch.walls[:] = True
+
+        result = self.batch.spawn_food(np.arange(self.batch.count))
+
+        self.assertTrue((result == -1).all())
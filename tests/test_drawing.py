@@ -0,0 +1,155 @@
+import os
+import random
+import unittest.mock
+
+from parameterized import parameterized
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from game.autopilot import Autopilot
+from game.direction import Direction
+from game.drawing.game_drawing import FieldDrawing
+from game.drawing.sprites import SpriteCache, sprites
+from game.drawing.text import TextCache
+from game.entities import Level
+from game.service_entities.viewport import Viewport
+from game.settings import Settings
+
+settings = Settings.get()
+
+_levels = [*settings.levels, 'free']
+
+
+class TestFieldDrawing(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        self.addCleanup(pygame.display.quit)
+
+    @staticmethod
+    def make_drawing(level: Level, view_size, incremental: bool) -> FieldDrawing:
+        field = level.field
+        viewport = Viewport(view_size, (field.width, field.height))
+        size_cell = FieldDrawing.size_cell
+        surface = pygame.Surface((viewport.width * size_cell, viewport.height * size_cell))
+        return FieldDrawing(field, settings.background_image(level.name), surface, incremental, viewport)
+
+    @parameterized.expand([(name, scroll, steps_per_frame) for name in _levels
+                           for scroll in (False, True) for steps_per_frame in (1, 3)])
+    def test_draw_incrementalSameAsFull(self, name, scroll, steps_per_frame):
+        """Инкрементальные кадры попиксельно совпадают с полной перерисовкой"""
+        level = Level(name, 3, seed=1)
+        view_size = (9, 7) if scroll else (level.field.width, level.field.height)
+        full = self.make_drawing(level, view_size, False)
+        incremental = self.make_drawing(level, view_size, True)
+        autopilot = Autopilot()
+        rnd = random.Random(2)
+
+        for step in range(150):
+            if level.finished:
+                break
+            direction = autopilot.direction(level.field)
+            if not rnd.randrange(8):
+                direction = rnd.choice(list(Direction))
+            level.play_step(direction)
+            if step % steps_per_frame:
+                continue
+            full.draw()
+            incremental.draw()
+            self.assertEqual(pygame.image.tostring(full.surface, 'RGB'),
+                             pygame.image.tostring(incremental.surface, 'RGB'),
+                             f'кадр {step}')
+
+    def test_draw_incrementalWithoutFullScan(self):
+        level = Level('free', 3, seed=1)
+        drawing = self.make_drawing(level, (level.field.width, level.field.height), True)
+        drawing.draw()
+        autopilot = Autopilot()
+
+        with unittest.mock.patch.object(drawing, '_snake_sprites') as snake_sprites, \
+                unittest.mock.patch.object(drawing, '_visible_cells') as visible_cells:
+            for _ in range(30):
+                level.play_step(autopilot.direction(level.field))
+                self.assertLessEqual(len(drawing.draw()), 8)
+
+        self.assertFalse(snake_sprites.called)
+        self.assertFalse(visible_cells.called)
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.addCleanup(pygame.font.quit)
+        self.cache = TextCache(max_fonts=2, max_surfaces=3)
+
+    def test_render_hit(self):
+        surface = self.cache.render('Score', None, 20, 'black')
+
+        self.assertIs(surface, self.cache.render('Score', None, 20, pygame.Color('black')))
+
+    def test_render_colorInKey(self):
+        black = self.cache.render('Score', None, 20, 'black')
+        red = self.cache.render('Score', None, 20, 'red')
+
+        self.assertIsNot(black, red)
+        self.assertIs(black, self.cache.render('Score', None, 20, 'black'))
+
+    def test_render_evictsLeastRecentlyUsed(self):
+        first = self.cache.render('1', None, 20, 'black')
+        second = self.cache.render('2', None, 20, 'black')
+        self.cache.render('3', None, 20, 'black')
+        # обращение делает '1' свежим, вытесняется '2'
+        self.cache.render('1', None, 20, 'black')
+
+        self.cache.render('4', None, 20, 'black')
+
+        self.assertIs(first, self.cache.render('1', None, 20, 'black'))
+        self.assertIsNot(second, self.cache.render('2', None, 20, 'black'))
+
+    def test_font_reusedPerSize(self):
+        with unittest.mock.patch.object(pygame.font, 'SysFont', wraps=pygame.font.SysFont) as sys_font:
+            for text in ('a', 'b', 'c'):
+                self.cache.render(text, None, 20, 'black')
+            self.cache.render('a', None, 30, 'black')
+
+        self.assertEqual([(None, 20), (None, 30)], [call.args for call in sys_font.call_args_list])
+        self.assertIsNot(self.cache.font(None, 20), self.cache.font(None, 30))
+
+
+class TestSpriteCache(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.addCleanup(pygame.display.quit)
+        self.cache = SpriteCache()
+
+    def test_get_cachesRotation(self):
+        image = pygame.image.load(settings.picture('snake_head'))
+
+        with unittest.mock.patch.object(pygame.transform, 'rotate', wraps=pygame.transform.rotate) as rotate:
+            sprite = self.cache.get('snake_head', 90)
+            self.assertIs(sprite, self.cache.get('snake_head', 90))
+            self.assertEqual(1, rotate.call_count)
+
+        expected = pygame.transform.rotate(image, 90)
+        self.assertEqual(pygame.image.tostring(expected, 'RGBA'), pygame.image.tostring(sprite, 'RGBA'))
+
+    def test_prepare_afterSetMode(self):
+        before = self.cache.get('wall')
+        screen = pygame.display.set_mode((1, 1))
+
+        self.cache.prepare(['wall'], self.cache.angles)
+
+        wall = self.cache.get('wall')
+        self.assertIsNot(before, wall)
+        self.assertEqual(screen.get_bitsize(), wall.get_bitsize())
+        self.assertEqual(pygame.image.tostring(before, 'RGBA'), pygame.image.tostring(wall, 'RGBA'))
+
+    def test_settingsReload_clears(self):
+        """Смена размера клетки и файлов спрайтов приходит через Settings.reload"""
+        sprite = sprites.get('wall')
+
+        Settings.reload()
+
+        self.assertIsNot(sprite, sprites.get('wall'))
@@ -0,0 +1,110 @@
+import random
+import unittest
+from collections import Counter
+
+from game.direction import Direction
+from game.entities import *
+from game.food_spawner import FoodSpawner
+from game.service_entities.vector import Vector
+
+gold = Food(1, 1, 2)
+fast = Food(1.4, 1, 1)
+
+
+class TestFoodSpawner(unittest.TestCase):
+    def make_spawner(self, types, period=10, max_count=2, seed=0) -> FoodSpawner:
+        snake = Snake([SnakePart(Vector(1, 0), Direction.RIGHT), SnakePart(Vector(0, 0), Direction.RIGHT)])
+        self.field = Field(snake, set(), (20, 20))
+        self.field.random = random.Random(seed)
+        return FoodSpawner(self.field, self.field.random, types, period, max_count)
+
+    def test_update_spawnsByPeriod(self):
+        spawner = self.make_spawner([(gold, 1, 0)], period=10, max_count=5)
+
+        spawner.update(0)
+        spawner.update(9)
+        self.assertEqual(1, len(self.field.foods_location))
+        spawner.update(10)
+        self.assertEqual(2, len(self.field.foods_location))
+        spawner.update(35)
+        self.assertEqual(4, len(self.field.foods_location))
+
+    def test_update_maxCount(self):
+        spawner = self.make_spawner([(gold, 1, 0)], period=1, max_count=2)
+
+        spawner.update(100)
+
+        self.assertEqual(2, len(self.field.foods_location))
+        self.assertEqual(2, len(spawner.active))
+
+    def test_update_expires(self):
+        spawner = self.make_spawner([(gold, 1, 5)], period=100)
+
+        spawner.update(0)
+        location, = self.field.foods_location
+        spawner.update(4)
+        self.assertIn(location, self.field.foods_location)
+        spawner.update(5)
+
+        self.assertEqual({}, self.field.foods_location)
+        self.assertEqual({}, spawner.active)
+        self.assertEqual(self.field.EMPTY, self.field.cells[self.field.index(location)])
+
+    def test_update_eatenNotRemovedAgain(self):
+        spawner = self.make_spawner([(gold, 1, 5)], period=100)
+        spawner.update(0)
+        location, = self.field.foods_location
+
+        self.field.remove_food(location)
+        spawner.eaten(location)
+        self.field.add_food(location, Food())
+        spawner.update(5)
+
+        self.assertEqual({location: Food()}, self.field.foods_location)
+
+    def test_update_weights(self):
+        spawner = self.make_spawner([(gold, 3, 1), (fast, 1, 1)], period=1, max_count=1)
+        kinds = Counter()
+
+        for now in range(4000):
+            spawner.update(now)
+            kinds.update(self.field.foods_location.values())
+
+        self.assertAlmostEqual(3, kinds[gold] / kinds[fast], delta=0.3)
+
+    def test_update_withoutDeadline(self):
+        spawner = self.make_spawner([(gold, 1, 50)], period=100)
+        spawner.update(0)
+        state = spawner.state()
+        random_state = self.field.random.getstate()
+
+        for now in range(1, 50):
+            spawner.update(now)
+
+        self.assertEqual(state, spawner.state())
+        self.assertEqual(random_state, self.field.random.getstate())
+
+    def test_level_restore(self):
+        level = Level('free', 1, seed=3)
+        for _ in range(160):
+            level.play_step()
+        snapshot = level.snapshot()
+
+        for _ in range(150):
+            level.play_step()
+        level.restore(snapshot)
+
+        self.assertEqual(snapshot, level.snapshot())
+        self.assertEqual(160, level.steps)
+        self.assertTrue(set(level.food_spawner.active) <= set(level.field.foods_location))
+        self.assertEqual(snapshot.food_spawner, level.food_spawner.state())
+
+    def test_level_playStep(self):
+        level = Level('free', 1, seed=3)
+
+        for _ in range(300):
+            level.play_step()
+            bonus = [food for food in level.field.foods_location.values() if food != Food()]
+            self.assertLessEqual(len(bonus), level.food_spawner.max_count)
+        self.assertEqual(300, level.steps)
+        self.assertTrue(level.food_spawner.active)
@@ -1,14 +1,50 @@
 import os
+import random
+import subprocess
+import sys
 import unittest.mock
 from copy import deepcopy
 
 from parameterized import parameterized
 
-from game.direction import Direction
+from game.direction import Direction, DirectionBuffer
 from game.entities import *
 from game.service_entities.vector import Vector
 
 
+class TestHeadless(unittest.TestCase):
+    def test_import_without_pygame(self):
+        code = ('import sys, game.entities, game.settings; '
+                'sys.exit("pygame" in sys.modules)')
+        self.assertEqual(0, subprocess.call([sys.executable, '-c', code]))
+
+
+class TestDirectionBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = DirectionBuffer(max_size=2)
+
+    def test_push_pop(self):
+        self.assertTrue(self.buffer.push(Direction.UP, Direction.RIGHT))
+        self.assertTrue(self.buffer.push(Direction.LEFT, Direction.RIGHT))
+
+        self.assertEqual(Direction.UP, self.buffer.pop())
+        self.assertEqual(Direction.LEFT, self.buffer.pop())
+        self.assertIsNone(self.buffer.pop())
+
+    @parameterized.expand([[Direction.RIGHT],
+                           [Direction.LEFT]])
+    def test_push_whenRepeatOrOpposite(self, direction):
+        self.assertFalse(self.buffer.push(direction, Direction.RIGHT))
+        self.assertEqual(0, len(self.buffer))
+
+    def test_push_whenFull(self):
+        self.buffer.push(Direction.UP, Direction.RIGHT)
+        self.buffer.push(Direction.LEFT, Direction.RIGHT)
+
+        self.assertFalse(self.buffer.push(Direction.DOWN, Direction.RIGHT))
+        self.assertEqual(2, len(self.buffer))
+
+
 class TestFood(unittest.TestCase):
     def test_hash(self):
         food1 = Food(1, 1, 1)
@@ -46,6 +82,9 @@ class TestSnake(unittest.TestCase):
     def test_iter(self):
         self.assertTrue(self.equals_snake(self.snake, self.snake_parts))
 
+    def test_reversed(self):
+        self.assertEqual(self.snake_parts[::-1], list(reversed(self.snake)))
+
     def test_len(self):
         self.assertEqual(len(self.snake_parts), len(self.snake))
 
@@ -62,6 +101,18 @@ class TestSnake(unittest.TestCase):
         self.assertEqual(old_speed * 2, self.snake.speed)
         self.assertEqual(old_length_change + 2, self.snake.length_change)
 
+    def test_snapshot(self):
+        self.snake.length_change = 2
+        snapshot = self.snake.snapshot()
+        self.snake.step(Direction.UP)
+
+        snake = Snake.from_snapshot(snapshot)
+
+        self.assertTrue(self.equals_snake(snake, self.snake_parts))
+        self.assertEqual(2, len(snake))
+        self.assertEqual(2, snake.length_change)
+        self.assertEqual(self.snake.speed, snake.speed)
+
     def test_check_intersection(self):
         self.assertFalse(self.snake.check_intersection())
 
@@ -139,6 +190,27 @@ class TestField(unittest.TestCase):
         self.field.snake = Snake([SnakePart(list(self.field.walls)[0], Direction.RIGHT)])
         self.assertTrue(self.field.is_crash())
 
+    def test_is_crash_whenSnakeBitesItself(self):
+        self.field.snake = Snake([SnakePart(Vector(1, 0), Direction.LEFT),
+                                  SnakePart(Vector(1, 0), Direction.RIGHT)])
+        self.assertTrue(self.field.is_crash())
+
+    def test_step_snake_updatesCells(self):
+        self.field.step_snake()
+
+        self.assertEqual(Field.BODY, self.field.cells[self.field.index(Vector(0, 0))])
+        self.assertEqual(Field.BODY, self.field.cells[self.field.index(Vector(3, 0))])
+        self.assertEqual(Field.EMPTY, self.field.cells[self.field.index(Vector(2, 0))])
+        self.assertEqual(Field.WALL, self.field.cells[self.field.index(Vector(1, 1))])
+
+    def test_set_snake_updatesCells(self):
+        old_snake = self.field.snake
+        self.field.snake = Snake([SnakePart(Vector(0, 3), Direction.RIGHT)])
+
+        for part in old_snake:
+            self.assertEqual(Field.EMPTY, self.field.cells[self.field.index(part.location)])
+        self.assertEqual(Field.BODY, self.field.cells[self.field.index(Vector(0, 3))])
+
     @unittest.mock.patch('game.entities.Snake.eat_food')
     def test_eat_food(self, mock):
         location = Vector(3, 0)
@@ -163,6 +235,130 @@ class TestField(unittest.TestCase):
         self.assertFalse(location in self.field.walls)
         self.assertFalse(location in [part for part in self.field.snake])
 
+    def test_free_cells_count(self):
+        # 16 клеток - 3 стены - 2 части змейки
+        self.assertEqual(11, self.field.free_cells_count)
+
+        self.field.step_snake()
+        self.assertEqual(11, self.field.free_cells_count)
+
+        self.field.generate_food()
+        self.assertEqual(10, self.field.free_cells_count)
+
+    def test_generate_food_whenOneFreeCell(self):
+        for _ in range(10):
+            self.field.generate_food()
+        location = self.field.generate_food()
+
+        self.assertEqual(0, self.field.free_cells_count)
+        self.assertEqual(11, len(self.field.foods_location))
+        self.assertTrue(location not in self.field.walls)
+
+        self.field.remove_food(location)
+        self.assertEqual(location, self.field.generate_food())
+
+
+class TestReachableFood(unittest.TestCase):
+    @staticmethod
+    def make_field(body, walls=(), size=(8, 8), seed=0) -> Field:
+        """:param body: [(x, y, Direction)] от головы к хвосту"""
+        snake = Snake([SnakePart(Vector(x, y), direction) for x, y, direction in body])
+        field = Field(snake, {Vector(*wall) for wall in walls}, size)
+        field.random.seed(seed)
+        return field
+
+    @staticmethod
+    def food_cells(field: Field, count: int) -> set:
+        cells = set()
+        for _ in range(count):
+            location = field.generate_food()
+            cells.add((location.x, location.y))
+            field.remove_food(location)
+        return cells
+
+    def test_generate_food_onlyInHeadRegion(self):
+        walls = [(x, y) for x in (2, 5) for y in range(8)]
+        field = self.make_field([(0, 3, Direction.UP), (0, 4, Direction.UP)], walls)
+
+        cells = self.food_cells(field, 300)
+
+        self.assertFalse({x for x, _ in cells} & {2, 3, 4, 5})
+        # через край поля столбцы 6-7 связаны со столбцами 0-1
+        self.assertTrue({x for x, _ in cells} & {6, 7})
+
+    def test_generate_food_notInPocketCutByBody(self):
+        body = [(4, 6, Direction.LEFT), (5, 6, Direction.LEFT), (6, 6, Direction.DOWN),
+                (6, 5, Direction.DOWN), (6, 4, Direction.RIGHT), (5, 4, Direction.RIGHT),
+                (4, 4, Direction.RIGHT), (3, 4, Direction.RIGHT), (2, 4, Direction.RIGHT)]
+        field = self.make_field(body)
+        self.assertIn((5, 5), self.food_cells(field, 500))
+
+        # клетка (5, 5) окружена телом, но голова рядом с ней
+        field.step_snake(Direction.UP)
+        self.assertIn((5, 5), self.food_cells(field, 500))
+
+        field.step_snake(Direction.LEFT)
+        self.assertNotIn((5, 5), self.food_cells(field, 500))
+
+    def test_generate_food_reusesFloodUntilPocketOpens(self):
+        body = [(4, 6, Direction.LEFT), (5, 6, Direction.LEFT), (6, 6, Direction.DOWN),
+                (6, 5, Direction.DOWN), (6, 4, Direction.RIGHT), (5, 4, Direction.RIGHT),
+                (4, 4, Direction.RIGHT), (3, 4, Direction.RIGHT), (2, 4, Direction.RIGHT)]
+        field = self.make_field(body)
+        field.step_snake(Direction.UP)
+        field.step_snake(Direction.LEFT)
+
+        with unittest.mock.patch.object(field, '_flood', wraps=field._flood) as flood:
+            self.assertNotIn((5, 5), self.food_cells(field, 300))
+            floods = flood.call_count
+
+            # хвост освободил клетку вне кармана (5, 5)
+            field.step_snake(Direction.LEFT)
+            self.assertNotIn((5, 5), self.food_cells(field, 300))
+            self.assertEqual(floods, flood.call_count)
+
+            # хвост открыл карман
+            field.step_snake(Direction.LEFT)
+            self.assertIn((5, 5), self.food_cells(field, 300))
+
+    def test_generate_food_whenNoReachableCell(self):
+        field = self.make_field([(0, 0, Direction.UP)], [(1, 0), (0, 1), (7, 0), (0, 7)])
+
+        self.assertNotEqual(Vector(0, 0), field.generate_food())
+
+    def test_generate_food_whenNotReachableFood(self):
+        field = self.make_field([(0, 3, Direction.UP), (0, 4, Direction.UP)],
+                                [(x, y) for x in (2, 4) for y in range(8)])
+        field.reachable_food = False
+
+        self.assertIn(3, {x for x, _ in self.food_cells(field, 300)})
+
+    def test_play_keepsCutFlagSound(self):
+        level = Level('free', 1, seed=2)
+        field = level.field
+        rnd = random.Random(5)
+
+        for _ in range(1500):
+            if level.finished:
+                break
+            level.play_step(rnd.choice([None, None, None, *Direction]))
+            head = field.index(field.snake.head.location)
+            neighbours = [index for index in field._neighbours(head) if field._passable(index)]
+            if not neighbours:
+                continue
+            reached = bytearray(len(field.cells))
+            reached[head] = 1
+            for neighbour in neighbours:
+                field._flood(neighbour, ~Field.FOOD, reached)
+            expected = [index for index in field.free_cells if reached[index]]
+            if not field._maybe_cut:
+                self.assertEqual(field.free_cells, expected)
+            elif field._reached is not None:
+                # запомненный обход совпадает с новым
+                marks, value = field._reached
+                self.assertEqual([index for index in field.free_cells
+                                  if (marks[index] == value if value else marks[index])], expected)
+
 
 class TestLevel(unittest.TestCase):
     def setUp(self):
@@ -205,6 +401,23 @@ class TestLevel(unittest.TestCase):
         self.assertFalse(self.field == self.level.field)
         self.equal_field(self.field, self.level.field)
 
+    def test_snapshot_restore(self):
+        food_location = self.level.field.generate_food(Food(2, 2, 2))
+        snapshot = self.level.snapshot()
+        cells = list(self.level.field.cells)
+        free_cells_count = self.level.field.free_cells_count
+
+        self.level.field.remove_food(food_location)
+        self.level.step_snake(Direction.UP)
+        self.level.score = 3
+        self.level.health = 1
+        self.level.restore(snapshot)
+
+        self.assertEqual(snapshot, self.level.snapshot())
+        self.assertEqual(cells, self.level.field.cells)
+        self.assertEqual(free_cells_count, self.level.field.free_cells_count)
+        self.assertEqual(Food(2, 2, 2), self.level.field.foods_location[food_location])
+
     @unittest.mock.patch('game.entities.Level.reset')
     def test_call_reset(self, mock):
         self.level.lose()
@@ -233,7 +446,7 @@ class TestLevel(unittest.TestCase):
 
     @unittest.mock.patch('game.entities.Level.lose')
     def test_step_snake_when_snake_break(self, mock):
-        self.level.field.walls.add(Vector(0, 1))
+        self.level.field.add_wall(Vector(0, 1))
         self.level.step_snake()
 
         self.assertTrue(mock.called)
@@ -251,3 +464,14 @@ class TestLevel(unittest.TestCase):
         self.level.step_snake()
 
         self.assertFalse(mock.called)
+
+    def test_restart(self):
+        level = Level('level_1', 3, seed=1)
+        for step in range(200):
+            if not step % 40:
+                level.spawn_bonus_food()
+            level.play_step(Direction.UP if step % 7 else Direction.LEFT)
+
+        level.restart(2, seed=5)
+
+        self.assertEqual(Level('level_1', 2, seed=5).snapshot(), level.snapshot())
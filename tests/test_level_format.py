@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import struct
+import unittest.mock
+
+from game.direction import Direction
+from game.entities import Field, Level
+from game.level_format import CompiledMap, label_regions
+
+
+class TestCompiledMap(unittest.TestCase):
+    map_path = os.path.join('tests', 'data', 'maps_for_test', 'map3x3.txt')
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, 'cache', 'map.bin')
+        patcher = unittest.mock.patch.object(CompiledMap, 'cache_path',
+                                             return_value=self.cache_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def assertMapEqual(self, expected: CompiledMap, actual: CompiledMap):
+        self.assertEqual((expected.width, expected.height), (actual.width, actual.height))
+        self.assertEqual(expected.walls, actual.walls)
+        self.assertEqual(expected.snake, actual.snake)
+        self.assertEqual(expected.direction, actual.direction)
+        self.assertEqual(expected.max_score, actual.max_score)
+        self.assertEqual(expected.regions, actual.regions)
+
+    def test_from_text(self):
+        compiled = CompiledMap.from_text(self.map_path)
+
+        self.assertEqual((3, 3), (compiled.width, compiled.height))
+        self.assertEqual([6, 7, 8], list(compiled.wall_indexes()))
+        self.assertEqual([(2, 1), (1, 1), (0, 1)], compiled.snake)
+        self.assertEqual(Direction.RIGHT, compiled.direction)
+        self.assertEqual(5, compiled.max_score)
+        self.assertEqual(([1] * 6 + [0] * 3, 1), compiled.regions)
+
+    def test_label_regions(self):
+        # клетка (3, 2) соединена только переходом через края - со стенами (3, 0) и (0, 2)
+        walls = bytes([0, 1, 0, 1,
+                       0, 1, 0, 1,
+                       1, 1, 1, 0])
+        regions, count = label_regions(walls, 4)
+
+        self.assertEqual(3, count)
+        self.assertEqual([1, 0, 2, 0,
+                          1, 0, 2, 0,
+                          0, 0, 0, 3], regions)
+
+        regions, count = label_regions(walls[:8] + bytes(4), 4)
+        self.assertEqual(1, count)
+
+    def test_to_bytes_from_buffer(self):
+        compiled = CompiledMap.from_text(self.map_path)
+        self.assertMapEqual(compiled, CompiledMap.from_buffer(compiled.to_bytes()))
+
+        self.assertRaises(ValueError, CompiledMap.from_buffer, b'SNAKE' * 10)
+        self.assertRaises(ValueError, CompiledMap.from_buffer, compiled.to_bytes()[:-4])
+
+    def test_load_usesCache(self):
+        compiled = CompiledMap.load(self.map_path)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        with unittest.mock.patch.object(CompiledMap, 'from_text') as mock:
+            self.assertMapEqual(compiled, CompiledMap.load(self.map_path))
+            self.assertFalse(mock.called)
+
+    def test_load_whenOldVersionCached(self):
+        CompiledMap.load(self.map_path)
+        with open(self.cache_path, 'r+b') as cfd:
+            cfd.seek(4)
+            cfd.write(struct.pack('<H', 1))
+
+        with unittest.mock.patch.object(CompiledMap, 'from_text',
+                                        wraps=CompiledMap.from_text) as mock:
+            self.assertEqual(([1] * 6 + [0] * 3, 1), CompiledMap.load(self.map_path).regions)
+            self.assertTrue(mock.called)
+
+    def test_parseMap_regionsFromCache(self):
+        expected, _ = Level.parse_map(self.map_path)
+
+        with unittest.mock.patch.object(Field, '_index_regions') as mock:
+            field, _ = Level.parse_map(self.map_path)
+            self.assertFalse(mock.called)
+        self.assertEqual(expected.free_cells, field.free_cells)
+
+    def test_load_whenMapChanged(self):
+        map_path = os.path.join(self.temp_dir, 'map.txt')
+        shutil.copy(self.map_path, map_path)
+        CompiledMap.load(map_path)
+
+        with open(map_path, 'a', encoding='utf-8') as mfd:
+            mfd.write('0')
+        self.assertEqual(50, CompiledMap.load(map_path).max_score)
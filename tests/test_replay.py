@@ -0,0 +1,67 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from game.direction import Direction
+from game.entities import Level
+from game.replay import GameRecord
+
+
+class TestGameRecord(unittest.TestCase):
+    @staticmethod
+    def play(record: GameRecord, steps: int) -> Level:
+        rnd = random.Random(7)
+        level = Level(record.level_name, record.health, record.seed, record.timed_food)
+        for step in range(steps):
+            if level.finished:
+                break
+            if not record.timed_food and not step % 50:
+                level.spawn_bonus_food()
+                record.add_bonus_food()
+            direction = rnd.choice([None, None, *Direction])
+            level.play_step(direction)
+            record.add_step(direction)
+        return level
+
+    def test_to_bytes_from_bytes(self):
+        record = GameRecord('level_1', 3, 2 ** 63 - 1)
+        record.add_step(Direction.UP)
+        record.add_step()
+        record.add_bonus_food()
+
+        actual = GameRecord.from_bytes(record.to_bytes())
+
+        self.assertEqual(('level_1', 3, 2 ** 63 - 1), (actual.level_name, actual.health, actual.seed))
+        self.assertEqual(bytearray([Direction.UP.value, GameRecord.NO_TURN, GameRecord.BONUS_FOOD]),
+                         actual.events)
+        self.assertRaises(ValueError, GameRecord.from_bytes, b'SNAKE')
+
+    def test_replay(self):
+        record = GameRecord('level_1', 3, 42)
+        level = self.play(record, 500)
+
+        replayed = record.replay()
+
+        self.assertEqual(level.snapshot(), replayed.snapshot())
+
+    def test_replay_version1(self):
+        record = GameRecord('level_1', 3, 42, version=1)
+        level = self.play(record, 500)
+
+        replayed = GameRecord.from_bytes(record.to_bytes()).replay(level=Level('level_1', 3))
+
+        self.assertIsNone(replayed.food_spawner)
+        self.assertEqual(level.snapshot(), replayed.snapshot())
+
+    def test_save_load(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, 'game.snr')
+        record = GameRecord('free', 1, 3)
+        level = self.play(record, 200)
+
+        record.save(path)
+
+        self.assertEqual(level.snapshot(), GameRecord.load(path).replay().snapshot())
@@ -0,0 +1,108 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from game.autopilot import Autopilot
+from game.direction import Direction
+from game.entities import Level
+from game.savegame import CheckpointFile, SaveGame
+
+
+class TestSaveGame(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    @staticmethod
+    def play(levels, steps: int, seed: int = 0):
+        """Одинаковые ходы на всех уровнях `levels`"""
+        autopilot = Autopilot()
+        rnd = random.Random(seed)
+        for step in range(steps):
+            if not step % 30:
+                for level in levels:
+                    if level.food_spawner is None:
+                        level.spawn_bonus_food()
+            direction = autopilot.direction(levels[0].field)
+            if not rnd.randrange(10):
+                direction = rnd.choice(list(Direction))
+            for level in levels:
+                level.play_step(direction)
+
+    def test_continue_afterLoad(self):
+        level = Level('free', 1, seed=4)
+        self.play([level], 300)
+
+        loaded = SaveGame.from_bytes(SaveGame.to_bytes(level))
+
+        self.assertEqual(level.snapshot(), loaded.snapshot())
+        self.assertEqual(level.food_spawner.state(), loaded.food_spawner.state())
+        self.play([level, loaded], 500, seed=1)
+        self.assertEqual(level.snapshot(), loaded.snapshot())
+        self.assertEqual(level.field.cells, loaded.field.cells)
+        self.assertEqual(SaveGame.to_bytes(level), SaveGame.to_bytes(loaded))
+
+    def test_continue_afterLoad_withoutTimedFood(self):
+        level = Level('free', 1, seed=4, timed_food=False)
+        self.play([level], 301)
+        # бонусная еда съедена, новая ещё не появилась
+        autopilot = Autopilot()
+        while level.bonus_food_location in level.field.foods_location:
+            level.play_step(autopilot.direction(level.field))
+
+        loaded = SaveGame.from_bytes(SaveGame.to_bytes(level))
+
+        self.assertIsNone(loaded.food_spawner)
+        self.assertEqual(level.snapshot(), loaded.snapshot())
+        self.play([level, loaded], 500, seed=1)
+        self.assertEqual(level.snapshot(), loaded.snapshot())
+        self.assertRaises(ValueError, SaveGame.from_bytes, SaveGame.to_bytes(level), Level('free', 1))
+
+    def test_load_version1(self):
+        """Сохранение первой версии: 60 шагов автопилота с бонусной едой каждые 25 шагов"""
+        level = Level('level_1', 3, seed=2, timed_food=False)
+        autopilot = Autopilot()
+        for step in range(60):
+            if not step % 25:
+                level.spawn_bonus_food()
+            level.play_step(autopilot.direction(level.field))
+
+        loaded = SaveGame.load(os.path.join('tests', 'data', 'level_1_v1.sav'))
+
+        self.assertIsNone(loaded.food_spawner)
+        self.assertEqual(level.snapshot()._replace(steps=0), loaded.snapshot())
+        self.play([level, loaded], 200)
+        self.assertEqual(level.field.cells, loaded.field.cells)
+
+    def test_load_intoLevel(self):
+        level = Level('level_1', 3, seed=2)
+        self.play([level], 50)
+        path = os.path.join(self.temp_dir, 'level.sav')
+        SaveGame.save(level, path)
+        other = Level('level_1', 3, seed=9)
+
+        self.assertIs(other, SaveGame.load(path, other))
+        self.assertEqual(level.snapshot(), other.snapshot())
+        self.assertRaises(ValueError, SaveGame.load, path, Level('level_2', 3))
+
+    def test_from_bytes_whenUnknownFormat(self):
+        data = SaveGame.to_bytes(Level('level_0', 3))
+
+        self.assertRaises(ValueError, SaveGame.from_bytes, data[:4])
+        self.assertRaises(ValueError, SaveGame.from_bytes, b'SNKR' + data[4:])
+
+    def test_checkpoint_file(self):
+        levels = [Level('level_0', 3, seed=seed) for seed in range(3)]
+        for seed, level in enumerate(levels):
+            self.play([level], 20 * seed, seed)
+        path = os.path.join(self.temp_dir, 'checkpoint.savs')
+
+        CheckpointFile.write(path, levels)
+
+        with CheckpointFile(path) as checkpoints:
+            self.assertEqual(3, len(checkpoints))
+            self.assertEqual(levels[2].snapshot(), checkpoints.load(2).snapshot())
+            self.assertEqual(levels[0].snapshot(), checkpoints.load(0, Level('level_0', 3)).snapshot())
+            self.assertRaises(IndexError, checkpoints.load, 3)
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import random
+import unittest
+
+from game.arena import Arena
+from game.direction import Direction
+from game.server import GameClient, GameServer
+from game.server import _food_kind
+
+
+class TestGameServer(unittest.TestCase):
+    def setUp(self):
+        # Тики вызываются тестом вручную: до первого тика по расписанию 1000 секунд
+        self.server = GameServer(Arena.from_level('free', 0, seed=1), tick_rate=0.001)
+
+    def run_async(self, scenario):
+        async def run():
+            await self.server.start()
+            try:
+                await scenario()
+            finally:
+                await self.server.stop()
+        asyncio.run(run())
+
+    async def connect(self, count: int) -> list:
+        clients = [GameClient() for _ in range(count)]
+        for client in clients:
+            await client.connect('127.0.0.1', self.server.port)
+        return clients
+
+    async def tick(self, clients):
+        """
+        :return: состояние сервера сразу после тика (пока клиенты читают,
+        сервер уже может принять новые команды)
+        """
+        self.server.tick()
+        state = self.server_state()
+        for client in clients:
+            while (await client.receive())['type'] != 'tick':
+                pass
+        return state
+
+    def server_state(self):
+        arena = self.server.arena
+        field = arena.field
+        snakes = {number: [field.index(part.location) for part in reversed(arena.snakes[number])]
+                  for number, alive in enumerate(arena.alive) if alive}
+        foods = {field.index(location): _food_kind[food]
+                 for location, food in field.foods_location.items()}
+        return snakes, foods
+
+    def test_clients_mirrorServer(self):
+        async def scenario():
+            clients = await self.connect(5)
+            rnd = random.Random(2)
+            joins = 0
+            for _ in range(150):
+                for client in clients:
+                    if client.id in client.snakes:
+                        client.turn(rnd.choice(list(Direction)))
+                    else:
+                        client.join()
+                        joins += 1
+                await asyncio.sleep(0)
+                snakes, foods = await self.tick(clients)
+
+                for client in clients:
+                    self.assertEqual(snakes, {number: list(body) for number, body in client.snakes.items()})
+                    self.assertEqual(foods, client.foods)
+            self.assertEqual(149, clients[0].tick)
+            # номера погибших змеек достаются новым, и списки арены не растут
+            self.assertGreater(joins, 5)
+            self.assertLessEqual(len(self.server.arena.snakes), 6)
+
+        self.run_async(scenario)
+
+    def test_turn(self):
+        async def scenario():
+            client, = await self.connect(1)
+            head = self.server.arena.snakes[client.id].head
+            turn = next(direction for direction in Direction
+                        if direction != head.direction and direction.value % 2 != head.direction.value % 2)
+
+            client.turn(turn)
+            while not len(self.server._players[next(iter(self.server._players))].buffer):
+                await asyncio.sleep(0.001)
+            await self.tick([client])
+
+            self.assertEqual(turn, self.server.arena.snakes[client.id].head.direction)
+
+        self.run_async(scenario)
+
+    def test_disconnect(self):
+        async def scenario():
+            first, second = await self.connect(2)
+            self.assertEqual({first.id, second.id}, set(second.snakes))
+
+            await first.close()
+            while self.server.players_count != 1:
+                await asyncio.sleep(0.001)
+            await self.tick([second])
+
+            self.assertFalse(self.server.arena.alive[first.id])
+            self.assertNotIn(first.id, second.snakes)
+
+        self.run_async(scenario)
+
+    def test_malformedMessage_disconnects(self):
+        errors = []
+
+        async def scenario():
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            client, = await self.connect(1)
+            for line in (b'[]\n', b'5\n', b'"x"\n', b'{"turn": 99}\n', b'{"turn": "up"}\n', b'{turn\n'):
+                reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+                writer.write(line)
+                # сервер закрывает соединение сам, ничего не ответив после welcome
+                self.assertEqual('welcome', json.loads(await reader.readline())['type'])
+                self.assertEqual(b'', await reader.read())
+                writer.close()
+                while self.server.players_count != 1:
+                    await asyncio.sleep(0.001)
+
+                await self.tick([client])
+
+        self.run_async(scenario)
+        self.assertEqual([], errors)
+
+    def test_ticks(self):
+        self.server.tick_rate = 200
+
+        async def scenario():
+            client, = await self.connect(1)
+            for _ in range(10):
+                await client.receive()
+            self.assertEqual(9, client.tick)
+
+        self.run_async(scenario)
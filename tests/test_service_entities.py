@@ -1,7 +1,11 @@
 import unittest
+from copy import deepcopy
 
 from game.service_entities.queue import Queue
+from game.service_entities.scheduler import Scheduler
+from game.service_entities.profiler import Profiler
 from game.service_entities.vector import Vector
+from game.service_entities.viewport import Viewport
 
 
 class TestVector(unittest.TestCase):
@@ -19,6 +23,7 @@ class TestVector(unittest.TestCase):
         result = v * 3
 
         self.assertEqual([3, 6], [result.x, result.y])
+        self.assertEqual(result, 3 * v)
 
     def test_add(self):
         v1 = Vector(1, 2)
@@ -34,6 +39,17 @@ class TestVector(unittest.TestCase):
         self.assertEqual(hash(v1), hash(v1))
         self.assertNotEqual(hash(v1), hash(v2))
 
+        hashes = {hash(Vector(x, y)) for x in range(300) for y in range(300)}
+        self.assertEqual(300 * 300, len(hashes))
+        # младшие биты зависят от обеих координат
+        self.assertEqual(300, len({hash(Vector(x, 0)) & 0xFFFF for x in range(300)}))
+
+    def test_immutable(self):
+        v = Vector(1, 2)
+        with self.assertRaises(AttributeError):
+            v.x = 3
+        self.assertEqual(v, deepcopy(v))
+
     def test_init(self):
         v = Vector(1, 2)
         self.assertEqual([1, 2], [v.x, v.y])
@@ -79,6 +95,9 @@ class TestQueue(unittest.TestCase):
             self.assertEqual(i, item)
             i += 1
 
+    def test_reversed(self):
+        self.assertEqual([4, 3, 2, 1, 0], list(reversed(self.queue)))
+
     def test_enqueue_dequeue(self):
         q = Queue()
         q.enqueue(1)
@@ -90,4 +109,137 @@ class TestQueue(unittest.TestCase):
         self.assertEqual(4, q.dequeue())
 
 
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.slept = []
+        self.scheduler = Scheduler(clock=lambda: self.now, sleep=self.slept.append)
+
+    def test_update_usesRealPeriod(self):
+        self.scheduler.every('step', 1 / 15.9)
+        self.now = 1.0
+
+        self.assertEqual(['step'] * 5, self.scheduler.update())
+        self.now = 2.0
+        self.assertEqual(['step'] * 5, self.scheduler.update())
+
+        scheduler = Scheduler(clock=lambda: self.now, max_catch_up=100)
+        scheduler.every('step', 1 / 15.9)
+        self.now = 3.0
+        self.assertEqual(15, len(scheduler.update()))
+
+    def test_update_ordersEvents(self):
+        self.scheduler.every('slow', 0.3)
+        self.scheduler.every('fast', 0.2, delay=0)
+        self.now = 0.45
+
+        self.assertEqual(['fast', 'fast', 'slow', 'fast'], self.scheduler.update())
+        self.assertEqual([], self.scheduler.update())
+
+    def test_update_rereadsPeriod(self):
+        periods = [0.5]
+        self.scheduler.every('step', lambda: periods[0])
+        self.now = 0.5
+        self.assertEqual(['step'], self.scheduler.update())
+
+        periods[0] = 0.1
+        self.now = 1.25
+        self.assertEqual(['step', 'step', 'step'], self.scheduler.update())
+
+    def test_wait(self):
+        self.scheduler.every('step', 0.25)
+        self.now = 0.1
+        self.scheduler.wait()
+
+        self.assertAlmostEqual(0.15, self.slept[0])
+
+        self.scheduler.cancel('step')
+        self.scheduler.wait()
+        self.assertEqual(1, len(self.slept))
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.profiler = Profiler(window=100, clock=lambda: self.now)
+
+    def test_phase(self):
+        for i in range(1, 101):
+            with self.profiler.phase('step'):
+                self.now += i / 1000
+
+        self.assertEqual({50: 0.051, 95: 0.096, 99: 0.1},
+                         {p: round(v, 6) for p, v in self.profiler.percentiles('step').items()})
+        self.assertEqual(['step'], self.profiler.phases)
+
+    def test_window(self):
+        profiler = Profiler(window=2)
+        for seconds in (3, 1, 2):
+            profiler.add('draw', seconds)
+
+        self.assertEqual({50: 2, 95: 2, 99: 2}, profiler.percentiles('draw'))
+
+    def test_frame(self):
+        self.profiler.frame()
+        self.now = 0.25
+        self.profiler.frame()
+
+        self.assertEqual({50: 0.25}, self.profiler.percentiles('frame', (50,)))
+
+    def test_histogram(self):
+        for seconds in (0.000001, 0.000003, 0.0000035, 0.001):
+            self.profiler.add('display', seconds)
+
+        self.assertEqual({2: 1, 4: 2, 1024: 1}, self.profiler.histogram('display'))
+
+    def test_disabled(self):
+        profiler = Profiler(enabled=False)
+        with profiler.phase('step'):
+            pass
+        profiler.frame()
+
+        self.assertEqual([], profiler.phases)
+        self.assertEqual({}, profiler.stats())
+
+
+class TestViewport(unittest.TestCase):
+    def setUp(self):
+        self.viewport = Viewport((10, 8), (100, 50), margin=2)
+
+    def test_init_whenFieldSmaller(self):
+        viewport = Viewport((10, 8), (6, 20))
+
+        self.assertEqual((6, 8), (viewport.width, viewport.height))
+
+    def test_center(self):
+        self.viewport.center(Vector(50, 1))
+
+        self.assertEqual((45, 0), (self.viewport.x, self.viewport.y))
+
+        self.viewport.center(Vector(99, 49))
+        self.assertEqual((90, 42), (self.viewport.x, self.viewport.y))
+
+    def test_follow(self):
+        self.assertEqual((0, 0), self.viewport.follow(Vector(7, 5)))
+        self.assertEqual((1, 0), self.viewport.follow(Vector(8, 5)))
+        self.assertEqual((1, 0), (self.viewport.x, self.viewport.y))
+        self.assertEqual((0, 0), self.viewport.follow(Vector(3, 5)))
+        self.assertEqual((-1, 0), self.viewport.follow(Vector(2, 5)))
+
+    def test_follow_clampsToField(self):
+        self.assertEqual((90, 42), self.viewport.follow(Vector(99, 49)))
+        self.assertEqual((-90, -42), self.viewport.follow(Vector(0, 0)))
+
+    def test_contains(self):
+        self.viewport.center(Vector(50, 25))
+
+        self.assertIn(Vector(45, 21), self.viewport)
+        self.assertIn(Vector(54, 28), self.viewport)
+        self.assertNotIn(Vector(55, 28), self.viewport)
+        self.assertNotIn(Vector(45, 20), self.viewport)
+
+    def test_index_ranges(self):
+        viewport = Viewport((2, 2), (5, 4))
+        viewport.center(Vector(3, 3))
 
+        self.assertEqual([(12, 14), (17, 19)], list(viewport.index_ranges()))
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from game.entities import Food, Level
+from game.settings import Settings
+
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        self.settings = Settings()
+
+    def test_food(self):
+        self.assertEqual((1.0, 1, 1), self.settings.food[0])
+        self.assertEqual(len(self.settings.food) - 1, len(self.settings.not_basic_food))
+        self.assertNotIn((1.0, 1, 1), self.settings.not_basic_food)
+        self.assertEqual('basic_apple', self.settings.food_name_picture[1.0, 1, 1])
+
+    def test_bonus_food(self):
+        self.assertEqual(len(self.settings.not_basic_food), len(self.settings.bonus_food))
+        self.assertIn(((1.0, 1, 2), 2.0, 100), self.settings.bonus_food)
+        self.assertEqual((1.0, 0), Settings._parse_food_spawn('1,1,1'))
+        self.assertEqual((0.5, 30), Settings._parse_food_spawn('1,1,1,0.5,30'))
+
+    def test_picture(self):
+        self.assertEqual(os.path.join('sprites', 'wall.png'), self.settings.picture('wall'))
+        self.assertRaises(FileNotFoundError, self.settings.picture, 'unknown')
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.settings.picture_size = 1
+        with self.assertRaises(TypeError):
+            self.settings.food_name_picture[1, 1, 1] = 'apple'
+
+    def test_get(self):
+        self.assertIs(Settings.get(), Settings.get())
+
+    def test_reload(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        filename = os.path.join(temp_dir, 'settings.ini')
+        shutil.copy('settings.ini', filename)
+
+        shared = Settings._shared
+        # после теста перечитать исходные настройки и таблицы из них
+        self.addCleanup(Settings.reload)
+        self.addCleanup(setattr, Settings, '_shared', shared)
+        Settings._shared = Settings(filename)
+
+        with open(filename, 'r', encoding='utf8') as fd:
+            text = fd.read()
+        with open(filename, 'w', encoding='utf8') as fd:
+            fd.write(text.replace('size_picture = 16', 'size_picture = 32')
+                     .replace('gold_apple = 1,1,2,2,100', 'gold_apple = 1,1,2,5,30'))
+
+        self.assertIs(Settings._shared, Settings.reload())
+        self.assertEqual(32, Settings.get().picture_size)
+        self.assertIn((Food(1, 1, 2), 5.0, 30), Level.bonus_food)
+
+    def test_on_reload(self):
+        calls = []
+        callback = Settings.on_reload(calls.append)
+        self.addCleanup(Settings._reload_callbacks.remove, callback)
+
+        Settings.reload()
+
+        self.assertEqual([Settings.get()], calls)
@@ -0,0 +1,84 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from game.direction import Direction
+from game.entities import Level
+from game.replay import GameRecord
+from game.tournament import *
+from game.tournament import _init_worker, aggregate, make_jobs
+
+
+class TestTournament(unittest.TestCase):
+    def test_play_game_isRepeatable(self):
+        job = ('random', 'level_1', 3, 11, None)
+
+        first = play_game(job)
+        play_game(('autopilot', 'level_1', 3, 12, None))
+        second = play_game(job)
+
+        self.assertEqual(first[:5], second[:5])
+
+    def test_play_game_autopilotWins(self):
+        policy, level, score, steps, win, _ = play_game(('autopilot', 'level_0', 3, 1, None))
+
+        self.assertTrue(win)
+        self.assertGreaterEqual(score, Level('level_0', 3).max_score)
+
+    @parameterized.expand([(1,), (2,)])
+    def test_play_game_replay(self, version):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, 'game.snr')
+        rnd = random.Random(3)
+        record = GameRecord('level_2', 3, 8, version=version)
+        level = Level('level_2', 3, 8, record.timed_food)
+        for step in range(300):
+            if level.finished:
+                break
+            if not record.timed_food and not step % 40:
+                level.spawn_bonus_food()
+                record.add_bonus_food()
+            direction = rnd.choice([None, None, *Direction])
+            level.play_step(direction)
+            record.add_step(direction)
+        record.save(path)
+
+        jobs = make_jobs(['replay'], [], 0, records=[path])
+        _init_worker(['level_2'], 5000)
+        result = play_game(jobs[0])
+
+        steps = sum(event != GameRecord.BONUS_FOOD for event in record.events)
+        self.assertGreater(level.score, 0)
+        self.assertEqual(('replay', 'level_2', level.score, steps, level.win_flag), result[:5])
+
+    def test_make_jobs(self):
+        jobs = make_jobs(['autopilot', 'random'], ['level_0', 'free'], 2, seed=10)
+
+        self.assertEqual(8, len(jobs))
+        self.assertIn(('random', 'free', 1, 11, None), jobs)
+        self.assertIn(('autopilot', 'level_0', 3, 10, None), jobs)
+
+    def test_aggregate(self):
+        results = [('random', 'free', 2, 10, False, 0.5),
+                   ('random', 'free', 4, 30, False, 0.5),
+                   ('autopilot', 'level_0', 10, 100, True, 0.1)]
+
+        summary = aggregate(results)
+
+        self.assertEqual({'games': 2, 'score_mean': 3, 'score_max': 4, 'steps_mean': 20,
+                          'win_rate': 0, 'steps_per_s': 40}, summary['random', 'free'])
+        self.assertEqual(['autopilot', 'random'], [policy for policy, _ in summary])
+
+    def test_run_tournament(self):
+        jobs = make_jobs(['autopilot', 'random'], ['level_0', 'free'], 3)
+
+        summary = run_tournament(jobs, workers=2, max_steps=300)
+
+        self.assertEqual(4, len(summary))
+        self.assertEqual(1, summary['autopilot', 'level_0']['win_rate'])
+        self.assertLessEqual(summary['autopilot', 'free']['steps_mean'], 300)